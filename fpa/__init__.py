@@ -0,0 +1,70 @@
+"""
+FPA 분석 패키지 (리포트 렌더링을 제외하면 PyQt5 의존성 없음)
+
+로그 파싱, 이벤트 분석, xG, 요약 통계, 점수 계산, 모멘텀, 선수 명단, 시즌 집계, 여러 파일 병합, 리더보드, 실시간 통계 서버를 제공합니다.
+서버 / 노트북 / 워커 프로세스에서 GUI 없이 사용할 수 있습니다.
+
+`import fpa` 자체는 아무 하위 모듈도 불러오지 않으며, `fpa.calculate_pass_score` 처럼
+처음 접근할 때 해당 하위 모듈만 불러옵니다. (PEP 562 모듈 __getattr__)
+예를 들어 `fpa.parse_log_line` 은 표준 라이브러리만 사용하고,
+`fpa.calculate_pass_score` 는 numpy 만, 데이터프레임을 다루는 함수는 pandas 까지 불러옵니다.
+리포트 렌더링(`fpa.render_reports`)만 PyQt5 의 QtGui 를 사용합니다.
+"""
+import importlib
+
+# 공개 이름 → 정의된 하위 모듈
+_EXPORTS = {
+    # constants
+    'LOG_COLUMNS': 'constants', 'ANALYZED_COLUMNS': 'constants', 'SHOT_ACTIONS': 'constants',
+    'ACTION_CODES': 'constants', 'TAG_CODES': 'constants', 'FIELD_W': 'constants', 'FIELD_H': 'constants',
+    # logs (표준 라이브러리만 사용)
+    'parse_log_line': 'logs', 'build_log_record': 'logs', 'analyze_pass_row': 'logs',
+    'StreamingCsvExporter': 'logs',
+    # analysis
+    'analyze_pass_data': 'analysis',
+    # xg
+    'xg_from_position': 'xg', 'add_xg_to_data': 'xg',
+    # summary
+    'create_match_partials': 'summary', 'merge_partials': 'summary',
+    'derive_pass_summary': 'summary', 'derive_shooter_summary': 'summary', 'derive_cross_summary': 'summary',
+    'derive_tackle_summary': 'summary', 'derive_heading_summary': 'summary',
+    'create_player_summary': 'summary', 'create_shooter_summary': 'summary', 'create_cross_summary': 'summary',
+    'create_tackle_summary': 'summary', 'create_heading_summary': 'summary',
+    'score_summaries': 'summary', 'create_summary_sheets': 'summary',
+    # scores (numpy 만 사용)
+    'calculate_pass_score': 'scores', 'calculate_shooting_score': 'scores', 'calculate_cross_score': 'scores',
+    'calculate_tackle_score': 'scores', 'calculate_heading_score': 'scores',
+    # timeline
+    'parse_event_minute': 'timeline', 'create_momentum_timeline': 'timeline', 'MomentumTracker': 'timeline',
+    # roster (단건 조회는 표준 라이브러리만 사용)
+    'RosterRegistry': 'roster',
+    # season
+    'load_roster': 'season', 'load_match_data': 'season', 'load_match_partials': 'season', 'aggregate_season': 'season',
+    'create_season_summaries': 'season', 'read_event_file': 'season',
+    # merge
+    'merge_event_files': 'merge',
+    # leaderboard
+    'Leaderboard': 'leaderboard', 'compute_player_metrics': 'leaderboard',
+    # validation
+    'validate_events': 'validation', 'repair_events': 'validation', 'normalize_jersey': 'validation',
+    'has_errors': 'validation',
+    # server (표준 라이브러리 asyncio)
+    'StatsServer': 'server',
+    # reports (PyQt5 QtGui 필요)
+    'render_reports': 'reports',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value  # 다음 접근부터는 __getattr__ 를 거치지 않음
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
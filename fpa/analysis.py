@@ -0,0 +1,77 @@
+"""
+이벤트 데이터프레임 분석 (보정 좌표, 패스 거리/방향)
+"""
+import pandas as pd
+import numpy as np
+
+from fpa.constants import FIELD_W, FIELD_H
+
+
+def analyze_pass_data(df):
+    """
+    경기 이벤트 데이터프레임을 분석하여 보정 좌표, 패스 거리, 패스 방향을 추가합니다.
+
+    Args:
+        df (pd.DataFrame): 'StartX', 'StartY', 'EndX', 'EndY', 'Direction' 등의
+                           컬럼을 포함하는 데이터프레임.
+
+    Returns:
+        pd.DataFrame: 분석 결과(보정 좌표, 거리, 방향 등)가 추가된 데이터프레임.
+    """
+    # --- 0. 사전 준비 ---
+    coord_cols = ['StartX', 'StartY', 'EndX', 'EndY']
+
+    # 분석에 필요한 컬럼이 없는 경우 원본 데이터프레임 반환 (상세 내용은 fpa.validation 으로 확인)
+    if not all(col in df.columns for col in coord_cols + ['Direction']):
+        print("분석에 필요한 컬럼이 부족합니다.")
+        return df
+
+    # 좌표 데이터가 숫자가 아닐 경우를 대비해 숫자형으로 변환
+    for col in coord_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # --- 1. 보정 좌표 산출 ---
+    # Direction이 'left'일 경우, 모든 좌표를 180도 회전시켜 'right' 기준으로 통일
+    is_left_direction = df['Direction'].str.lower() == 'left'
+
+    df['StartX_adj'] = np.where(is_left_direction, FIELD_W - df['StartX'], df['StartX'])
+    df['StartY_adj'] = np.where(is_left_direction, FIELD_H - df['StartY'], df['StartY'])
+    df['EndX_adj'] = np.where(is_left_direction, FIELD_W - df['EndX'], df['EndX'])
+    df['EndY_adj'] = np.where(is_left_direction, FIELD_H - df['EndY'], df['EndY'])
+
+    # --- 2. 패스 거리 분류 ---
+    # 보정된 좌표를 기준으로 두 점 사이의 거리(유클리드 거리) 계산
+    distance = np.sqrt(
+        (df['EndX_adj'] - df['StartX_adj']) ** 2 + (df['EndY_adj'] - df['StartY_adj']) ** 2
+    )
+    df['Distance'] = distance
+
+    # 거리(distance) 값에 따라 구간 나누기
+    conditions_dist = [
+        distance < 20,
+        (distance >= 20) & (distance < 40),
+        distance >= 40
+    ]
+    choices_dist = ['short', 'middle', 'long']
+    df['Pass_Distance'] = np.select(conditions_dist, choices_dist, default=None)
+
+    # --- 3. 패스 방향 분류 ---
+    # 보정된 좌표를 기준으로 각도 계산 (atan2 사용)
+    dx = df['EndX_adj'] - df['StartX_adj']
+    dy = df['EndY_adj'] - df['StartY_adj']
+    angle = np.degrees(np.arctan2(dy, dx))
+
+    # 각도를 0~360 범위로 변환
+    df['Angle'] = (angle + 360) % 360
+
+    # 각도(angle) 값에 따라 방향 분류
+    conditions_dir = [
+        (df['Angle'] >= 315) | (df['Angle'] < 45),  # 전진 (forward)
+        (df['Angle'] >= 45) & (df['Angle'] < 135),  # 좌측 (left)
+        (df['Angle'] >= 135) & (df['Angle'] < 225),  # 후진 (backward)
+        (df['Angle'] >= 225) & (df['Angle'] < 315)  # 우측 (right)
+    ]
+    choices_dir = ['forward', 'left', 'backward', 'right']
+    df['Pass_Direction'] = np.select(conditions_dir, choices_dir, default=None)
+
+    return df
@@ -0,0 +1,25 @@
+"""
+로그 / 분석 데이터프레임 공통 상수
+"""
+
+LOG_COLUMNS = ["No", "MatchID", "Date", "TeamID", "Half", "Team", "Direction", "Time", "Player", "PlayerID",
+               "Receiver", "ReceiverID", "Action", "StartX", "StartY", "EndX", "EndY", "Tags"]
+# analyze_pass_data 가 추가하는 컬럼 (추가 순서 그대로)
+ANALYZED_COLUMNS = LOG_COLUMNS + ['StartX_adj', 'StartY_adj', 'EndX_adj', 'EndY_adj',
+                                  'Distance', 'Pass_Distance', 'Angle', 'Pass_Direction']
+SHOT_ACTIONS = ['Goal', 'Shot On Target', 'Shot', 'Blocked Shot']
+# 경기장 규격 (m). 로그 좌표, 보정 좌표, 검증 범위, 화면 / 리포트 좌표 변환이 모두 이 크기를 기준으로 함
+FIELD_W = 105
+FIELD_H = 68
+
+# 입력 코드 → 액션 / 태그 이름
+ACTION_CODES = {
+    's': 'Pass', 'c': 'Cross', 'r': 'Dribble', 'e': 'Breakthrough',
+    't': 'Tackle', 'u': 'Duel', 'd': 'Shot', 'dd': 'Shot On Target',
+    'ddd': 'Goal', 'db': 'Blocked Shot', 'i': 'Intercept', 'l': 'Clear',
+    'b': 'Block', 'q': 'Acquisition', 'v': 'Save', 'm': 'Miss', 'f': 'Foul', 'o': 'Offside'
+}
+TAG_CODES = {
+    'k': 'Key', 'a': 'Assist', 'h': 'Header', 'r': 'Aerial',
+    'w': 'Suffered', 'n': 'In-box', 'u': 'Out-box'
+}
@@ -0,0 +1,360 @@
+"""
+시즌 리더보드 (점수 / 누적 기록 순위)
+
+경기를 하나 추가할 때마다 해당 경기에 나온 선수들의 누계와 점수만 다시 계산하고,
+지표별 정렬 목록에서 그 선수들의 위치만 옮깁니다. (리그 전체를 다시 정렬하지 않음)
+모든 점수는 선수 한 명의 기록만으로 계산되는 절대평가이므로 다른 선수의 점수는 바뀌지 않습니다.
+
+기간(date_from / date_to)을 지정한 조회는 메모리에 보관한 경기별 부분 집계만 합쳐 계산하므로
+경기 파일을 다시 읽지 않습니다.
+"""
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from fpa.roster import _team_key, fill_player_ids
+from fpa.scores import (
+    calculate_pass_score, calculate_shooting_score, calculate_cross_score,
+    calculate_tackle_score, calculate_heading_score)
+from fpa.summary import (
+    create_match_partials, merge_partials, derive_pass_summary, derive_shooter_summary,
+    derive_cross_summary, derive_tackle_summary, derive_heading_summary)
+
+# 점수 지표 → (순위에 포함되는 조건 컬럼, 요약 함수, 점수 함수)
+SCORE_METRICS = {
+    'Pass_Score': (['Total_Pass'], derive_pass_summary, calculate_pass_score),
+    'Shooting_Score': (['Total_Shots'], derive_shooter_summary, calculate_shooting_score),
+    'Cross_Score': (['Total_Crosses'], derive_cross_summary, calculate_cross_score),
+    'Tackle_Score': (['Total_Tackles'], derive_tackle_summary, calculate_tackle_score),
+    'Heading_Score': (['Total_Aerial_Duels', 'Total_Headed_Shots'], derive_heading_summary, calculate_heading_score),
+}
+# 부분 집계 컬럼을 그대로 쓰는 누적 지표
+TOTAL_METRICS = ['Goals', 'Total_xG', 'Key_Pass', 'Assist', 'Total_Shots', 'Successful_Tackles', 'Matches']
+# 횟수 지표는 정수, 나머지(점수 / xG)는 실수로 반환 (누계는 더하는 과정에서 실수가 되므로 조회 시 통일)
+COUNT_METRICS = ['Goals', 'Key_Pass', 'Assist', 'Total_Shots', 'Successful_Tackles', 'Matches']
+METRICS = list(SCORE_METRICS) + TOTAL_METRICS
+LEADERBOARD_COLUMNS = ['Rank', 'PlayerID', 'Value', 'TeamID', 'Position', 'Name']
+
+
+def compute_player_metrics(partials):
+    """
+    PlayerID 기준 부분 집계로부터 선수별 리더보드 지표를 계산합니다.
+
+    점수 지표는 해당 기록이 한 번 이상 있는 선수만 계산하고, 나머지는 NaN 입니다. (순위에서 제외)
+    """
+    metrics = pd.DataFrame(index=partials.index)
+    for metric, (volume_cols, derive, score) in SCORE_METRICS.items():
+        eligible = partials[partials[volume_cols].sum(axis=1) > 0]
+        if not eligible.empty:
+            metrics[metric] = score(derive(eligible))[metric]
+        else:
+            metrics[metric] = float('nan')
+    for metric in TOTAL_METRICS:
+        metrics[metric] = partials[metric]
+    return metrics
+
+
+class OrderedScores:
+    """
+    지표 하나의 정렬 목록. (-값, PlayerID) 를 오름차순으로 유지하므로 앞쪽이 높은 순위입니다.
+    값이 바뀐 선수만 bisect 로 빼고 다시 넣습니다.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.current = {}   # PlayerID → 목록에 들어 있는 키
+
+    def __len__(self):
+        return len(self.keys)
+
+    def update(self, player_id, value):
+        old = self.current.pop(player_id, None)
+        if old is not None:
+            del self.keys[bisect_left(self.keys, old)]
+        if value is not None and value == value:
+            key = (-value, player_id)
+            insort(self.keys, key)
+            self.current[player_id] = key
+
+    def value(self, player_id):
+        key = self.current.get(player_id)
+        return None if key is None else -key[0]
+
+    def top(self, k, accept=None):
+        """ 상위 k 명의 (순위, PlayerID, 값). 동점자는 같은 순위입니다. """
+        result = []
+        rank, count, last = 0, 0, None
+        for neg_value, player_id in self.keys:
+            if accept is not None and not accept(player_id):
+                continue
+            count += 1
+            if neg_value != last:
+                if len(result) >= k:
+                    break
+                rank, last = count, neg_value
+            result.append((rank, player_id, -neg_value))
+        return result
+
+    def rank(self, player_id, accept=None):
+        """ 선수의 순위 (자신보다 값이 큰 선수 수 + 1). 목록에 없으면 None. """
+        key = self.current.get(player_id)
+        if key is None or (accept is not None and not accept(player_id)):
+            return None
+        ahead = bisect_left(self.keys, (key[0], float('-inf')))
+        if accept is None:
+            return ahead + 1
+        return sum(1 for _, pid in self.keys[:ahead] if accept(pid)) + 1
+
+
+def match_date_of(df, match_date=None):
+    """
+    경기 날짜('YYYY-MM-DD')를 반환합니다. 파일의 Date 컬럼(export_log 가 기록)을 먼저 쓰고,
+    없으면 match_date 를 사용합니다. 둘 다 없으면 None 입니다. (기간 조회에서 제외)
+    """
+    if 'Date' in df.columns and df['Date'].notna().any():
+        return pd.to_datetime(df['Date'].dropna().iloc[0]).strftime('%Y-%m-%d')
+    if match_date is not None:
+        return pd.to_datetime(match_date).strftime('%Y-%m-%d')
+    return None
+
+
+def load_match_entry(file_path, roster_path=None, match_date=None):
+    """
+    경기 파일 하나를 리더보드에 넣을 (MatchID, 날짜, (PlayerID, TeamID) 부분 집계) 로 변환합니다. (map 단계)
+    Date 컬럼이 없는 예전 파일은 match_date 를 경기 날짜로 사용합니다.
+    """
+    from fpa.season import load_match_data
+
+    df = load_match_data(file_path, roster_path, match_date=match_date)
+    if 'PlayerID' not in df.columns:
+        raise ValueError(f"PlayerID 컬럼이 없습니다. 명단 파일(roster)을 함께 지정하세요: {file_path}")
+    match_ids = df['MatchID'].dropna().astype(str) if 'MatchID' in df.columns else pd.Series(dtype=str)
+    match_id = match_ids.iloc[0] if not match_ids.empty else file_path
+    return match_id, match_date_of(df, match_date), _match_partials(df)
+
+
+def _load_entry(load, file_path, match_date):
+    # executor.map 에 키워드 인자를 넘기기 위한 모듈 수준 함수 (피클 가능)
+    return load(file_path, match_date=match_date)
+
+
+def _add_team_matches(player_teams, team_matches):
+    """ (PlayerID, TeamID) 별 경기 수를 PlayerID → {TeamID: 경기 수} 에 더합니다. (0 이하가 된 팀은 제거) """
+    for (player_id, team_id), matches in team_matches.items():
+        # 파일에 따라 101 / 101.0 / '101' 로 읽히는 TeamID 를 명단과 같은 문자열 키로 통일
+        team_id = _team_key(team_id)
+        teams = player_teams.setdefault(player_id, {})
+        teams[team_id] = teams.get(team_id, 0) + matches
+        if teams[team_id] <= 0:
+            del teams[team_id]
+    return player_teams
+
+
+def _match_partials(df):
+    df = df.copy()
+    df['PlayerID'] = fill_player_ids(df)
+    return create_match_partials(df, keys=['PlayerID', 'TeamID'])
+
+
+class Leaderboard:
+    """
+    시즌 리더보드. 경기 단위로 추가/교체/삭제하면 영향받는 선수의 순위만 갱신됩니다.
+
+    사용 예:
+        board = Leaderboard(roster)
+        board.ingest_files(paths, roster_path='roster.csv')
+        board.top('Shooting_Score', k=10, team='101', position='FW')
+        board.rank('Goals', player_id=7, date_from='2026-03-01', date_to='2026-05-31')
+    """
+
+    def __init__(self, roster=None):
+        self.roster = roster
+        self.matches = {}       # MatchID → (날짜, (PlayerID, TeamID) 부분 집계)
+        self.totals = pd.DataFrame()  # PlayerID 기준 시즌 누계
+        self.player_teams = {}  # PlayerID → {TeamID: 경기 수}
+        self.indexes = {metric: OrderedScores() for metric in METRICS}
+        self._range_cache = {}  # (date_from, date_to) → (지표, 기간 안의 소속 팀) (경기가 바뀌면 비움)
+
+    def __len__(self):
+        return len(self.matches)
+
+    def _apply(self, changes):
+        """
+        [(부호, 경기 부분 집계), ...] 를 시즌 누계에 한 번에 더하거나 빼고, 바뀐 선수들의 PlayerID 를 반환합니다.
+        """
+        combined = pd.concat([sign * player_partials for sign, player_partials in changes],
+                             keys=range(len(changes)), names=['Change'])
+        by_player = combined.groupby(level='PlayerID').sum()
+        # 한 경기에서 두 TeamID 로 기록된 선수도 1경기로 세도록 경기별로 먼저 묶음
+        by_player['Matches'] = combined['Matches'].groupby(level=['Change', 'PlayerID']).max() \
+            .groupby(level='PlayerID').sum()
+        self.totals = self.totals.add(by_player, fill_value=0)
+
+        _add_team_matches(self.player_teams, combined['Matches'].groupby(level=['PlayerID', 'TeamID']).sum())
+        return by_player.index
+
+    def _refresh(self, affected):
+        # 영향받은 선수만 지표를 다시 계산해 정렬 목록에서 위치를 옮김
+        # 명단에서 찾지 못한 선수(음수 임시 PlayerID)는 누계에는 남기되 순위에는 넣지 않음
+        totals = self.totals.loc[affected]
+        gone = totals.index[totals['Matches'] <= 0]
+        totals = totals.drop(index=gone)
+        totals = totals[totals.index >= 0]
+        metrics = compute_player_metrics(totals) if not totals.empty else pd.DataFrame(columns=METRICS)
+
+        self.totals = self.totals.drop(index=gone)
+        for player_id in gone:
+            self.player_teams.pop(player_id, None)
+
+        for metric, index in self.indexes.items():
+            for player_id in gone:
+                index.update(player_id, None)
+            for player_id, value in metrics[metric].items():
+                index.update(player_id, value)
+
+    def ingest_matches(self, entries):
+        """
+        (MatchID, 날짜, (PlayerID, TeamID) 부분 집계) 목록을 추가합니다. 같은 MatchID 가 이미 있으면 교체합니다.
+        여러 경기를 한 번에 넣으면 영향받은 선수의 지표는 마지막에 한 번만 다시 계산합니다.
+        """
+        changes = []
+        for match_id, match_date, player_partials in entries:
+            if match_id in self.matches:
+                changes.append((-1, self.matches.pop(match_id)[1]))
+            self.matches[match_id] = (match_date, player_partials)
+            changes.append((1, player_partials))
+        if not changes:
+            return
+        affected = self._apply(changes)
+        self._range_cache.clear()
+        self._refresh(affected)
+
+    def ingest_match(self, match_id, player_partials, match_date=None):
+        self.ingest_matches([(match_id, match_date, player_partials)])
+
+    def ingest_frame(self, df, match_id, match_date=None):
+        """
+        분석 + xG + PlayerID 가 포함된 경기 데이터프레임을 추가합니다. (export_log 결과와 같은 형식)
+        경기 날짜는 Date 컬럼을 먼저 쓰고, 없으면 match_date 를 사용합니다.
+        """
+        self.ingest_match(match_id, _match_partials(df), match_date_of(df, match_date))
+
+    def remove_match(self, match_id):
+        if match_id not in self.matches:
+            return
+        affected = self._apply([(-1, self.matches.pop(match_id)[1])])
+        self._range_cache.clear()
+        self._refresh(affected)
+
+    def ingest_files(self, file_paths, roster_path=None, max_workers=None, match_dates=None):
+        """
+        경기 파일들을 프로세스 풀에서 병렬로 읽어 추가합니다. (시즌 초기 구성용)
+        match_dates ({파일 경로: 'YYYY-MM-DD'}) 는 Date 컬럼이 없는 파일의 경기 날짜로 사용합니다.
+        """
+        file_paths = list(file_paths)
+        match_dates = match_dates or {}
+        dates = [match_dates.get(path) for path in file_paths]
+        load = partial(load_match_entry, roster_path=roster_path)
+        if max_workers == 1 or len(file_paths) <= 1:
+            entries = [load(path, match_date=date) for path, date in zip(file_paths, dates)]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                entries = list(executor.map(partial(_load_entry, load), file_paths, dates))
+        self.ingest_matches(entries)
+
+    def _player_filter(self, team=None, position=None, player_teams=None):
+        # player_teams 를 주면 (기간 조회) 그 기간에 뛴 팀만으로 소속을 판단
+        if team is None and position is None:
+            return None
+        player_teams = self.player_teams if player_teams is None else player_teams
+        team = None if team is None else _team_key(team)
+        positions = {}
+        if position is not None and self.roster is not None:
+            positions = {entry['PlayerID']: entry['Position'] for entry in self.roster.entries}
+
+        def accept(player_id):
+            if team is not None and team not in player_teams.get(player_id, ()):
+                return False
+            return position is None or positions.get(player_id) == position
+        return accept
+
+    def _range_metrics(self, date_from, date_to):
+        """ 기간 안의 경기만 합친 (선수별 지표, PlayerID → {TeamID: 경기 수}) """
+        key = (date_from, date_to)
+        if key not in self._range_cache:
+            selected = [player_partials for match_date, player_partials in self.matches.values()
+                        if match_date is not None
+                        and (date_from is None or match_date >= date_from)
+                        and (date_to is None or match_date <= date_to)]
+            merged = merge_partials(selected)
+            if merged.empty:
+                self._range_cache[key] = (pd.DataFrame(columns=METRICS), {})
+            else:
+                by_player = merged.groupby(level='PlayerID').sum()
+                player_teams = _add_team_matches({}, merged['Matches'].groupby(level=['PlayerID', 'TeamID']).sum())
+                self._range_cache[key] = (compute_player_metrics(by_player[by_player.index >= 0]), player_teams)
+        return self._range_cache[key]
+
+    def _describe(self, metric, rows, player_teams=None):
+        players = self.roster.players() if self.roster is not None and len(self.roster) else None
+        player_teams = self.player_teams if player_teams is None else player_teams
+        cast = int if metric in COUNT_METRICS else float
+        records = []
+        for rank, player_id, value in rows:
+            teams = player_teams.get(player_id, {})
+            info = players.loc[player_id] if players is not None and player_id in players.index else None
+            records.append({
+                'Rank': int(rank), 'PlayerID': player_id, 'Value': cast(value),
+                'TeamID': max(teams, key=teams.get) if teams else '',
+                'Position': info['Position'] if info is not None else '',
+                'Name': info['Name'] if info is not None else '',
+            })
+        return pd.DataFrame(records, columns=LEADERBOARD_COLUMNS)
+
+    def top(self, metric, k=10, team=None, position=None, date_from=None, date_to=None):
+        """
+        지표별 상위 k 명을 반환합니다.
+
+        Args:
+            metric (str): METRICS 중 하나 (예: 'Shooting_Score', 'Goals').
+            k (int): 인원 수. 마지막 순위의 동점자는 모두 포함합니다.
+            team (str | None): 해당 팀 소속으로 뛴 선수만. (기간을 지정하면 그 기간에 해당 팀으로 뛴 선수만)
+            position (str | None): 명단의 Position 이 일치하는 선수만.
+            date_from, date_to (str | None): 'YYYY-MM-DD'. 지정하면 기간 안의 경기만 합산합니다.
+
+        Returns:
+            pd.DataFrame: Rank, PlayerID, Value, TeamID, Position, Name 컬럼.
+        """
+        if metric not in self.indexes:
+            raise KeyError(f"알 수 없는 지표입니다: {metric}")
+        if date_from is None and date_to is None:
+            return self._describe(metric, self.indexes[metric].top(k, self._player_filter(team, position)))
+
+        metrics, player_teams = self._range_metrics(date_from, date_to)
+        values = metrics[metric].dropna()
+        accept = self._player_filter(team, position, player_teams)
+        if accept is not None:
+            values = values[[accept(player_id) for player_id in values.index]]
+        ranks = values.rank(method='min', ascending=False).astype(int)
+        order = pd.DataFrame({'Rank': ranks, 'Value': values}).rename_axis('PlayerID').reset_index()
+        order = order.sort_values(['Rank', 'PlayerID'])
+        order = order[order['Rank'] <= order['Rank'].iloc[min(k, len(order)) - 1]] if len(order) else order
+        return self._describe(metric, zip(order['Rank'], order['PlayerID'], order['Value']), player_teams)
+
+    def rank(self, metric, player_id, team=None, position=None, date_from=None, date_to=None):
+        """ 선수의 지표 순위 (동점은 같은 순위). 순위에 없으면 None. 필터는 top 과 같습니다. """
+        if metric not in self.indexes:
+            raise KeyError(f"알 수 없는 지표입니다: {metric}")
+        if date_from is None and date_to is None:
+            return self.indexes[metric].rank(player_id, self._player_filter(team, position))
+
+        metrics, player_teams = self._range_metrics(date_from, date_to)
+        values = metrics[metric].dropna()
+        accept = self._player_filter(team, position, player_teams)
+        if player_id not in values.index or (accept is not None and not accept(player_id)):
+            return None
+        if accept is not None:
+            values = values[[accept(pid) for pid in values.index]]
+        return int((values > values[player_id]).sum()) + 1
@@ -0,0 +1,217 @@
+"""
+로그 문자열 파싱, 행 단위 분석, CSV 스트리밍 저장 (표준 라이브러리만 사용)
+"""
+import csv
+import io
+import math
+import os
+import re
+
+from fpa.constants import ANALYZED_COLUMNS, FIELD_W, FIELD_H
+
+
+def parse_log_line(log):
+    """
+    리스트 위젯의 로그 문자열 한 줄을 컬럼 딕셔너리로 변환합니다.
+    (No / MatchID / TeamID 는 포함하지 않음)
+    """
+    log_dict = {}
+    parts = log.split(' | ')
+    log_dict['Half'] = parts[0]
+    log_dict['Team'] = parts[1]
+    log_dict['Direction'] = parts[2]
+    log_dict['Time'] = parts[3]
+
+    pos_match = re.search(r'Pos\((.+?), (.+?)\)', parts[4])
+    if pos_match: log_dict['StartX'] = pos_match.group(1); log_dict['StartY'] = pos_match.group(2)
+
+    action_part = parts[5]
+    action_match = re.match(r'(\d+) (.+?)(?: to (\d+))?$', action_part)
+    if action_match:
+        log_dict['Player'] = action_match.group(1)
+        log_dict['Action'] = action_match.group(2)
+        log_dict['Receiver'] = action_match.group(3) if action_match.group(3) else ''
+
+    log_dict['EndX'] = ''
+    log_dict['EndY'] = ''
+    log_dict['Tags'] = ''
+    for part in parts[6:]:
+        if 'Pos' in part:
+            end_pos_match = re.search(r'Pos\((.+?), (.+?)\)', part)
+            if end_pos_match: log_dict['EndX'] = end_pos_match.group(1); log_dict['EndY'] = end_pos_match.group(2)
+        elif 'Tags' in part:
+            log_dict['Tags'] = part.replace('Tags: ', '')
+
+    return log_dict
+
+
+def build_log_record(log, no, match_id, teamid_h, teamid_a, roster=None, match_date=None):
+    """
+    로그 한 줄을 No / MatchID / TeamID 가 채워진 레코드로 변환합니다.
+    match_date ('YYYY-MM-DD') 가 주어지면 Date 컬럼에 기록합니다. (시즌 집계 / 리더보드의 기간 조회에 사용)
+    roster (RosterRegistry) 가 주어지면 PlayerID / ReceiverID 도 채웁니다. (명단에 없는 선수는 새로 등록)
+    """
+    record = parse_log_line(log)
+    record["No"] = no
+    record["MatchID"] = match_id
+    if match_date:
+        record["Date"] = match_date
+    team_val = str(record.get("Team", "")).strip().lower()
+    if team_val == "home":
+        record["TeamID"] = teamid_h
+    elif team_val == "away":
+        record["TeamID"] = teamid_a
+    if roster is not None:
+        team_id = record.get("TeamID")
+        record["PlayerID"] = roster.resolve(team_id, record.get("Player"), match_date, register=True)
+        if record.get("Receiver"):
+            record["ReceiverID"] = roster.resolve(team_id, record["Receiver"], match_date, register=True)
+    return record
+
+
+def _to_float(value):
+    # pd.to_numeric(errors='coerce') 와 동일하게 변환 실패 시 NaN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def analyze_pass_row(record):
+    """
+    analyze_pass_data 의 한 행(row) 버전입니다.
+    레코드 하나에 대해 보정 좌표, 거리 구간, 방향 구간을 계산해 딕셔너리로 반환합니다.
+    """
+    start_x, start_y = _to_float(record.get('StartX')), _to_float(record.get('StartY'))
+    end_x, end_y = _to_float(record.get('EndX')), _to_float(record.get('EndY'))
+
+    # Direction이 'left'일 경우 180도 회전
+    if str(record.get('Direction', '')).lower() == 'left':
+        start_x, start_y = FIELD_W - start_x, FIELD_H - start_y
+        end_x, end_y = FIELD_W - end_x, FIELD_H - end_y
+
+    dx = end_x - start_x
+    dy = end_y - start_y
+    distance = math.hypot(dx, dy)
+
+    pass_distance = None
+    if distance < 20:
+        pass_distance = 'short'
+    elif distance < 40:
+        pass_distance = 'middle'
+    elif distance >= 40:
+        pass_distance = 'long'
+
+    angle = (math.degrees(math.atan2(dy, dx)) + 360) % 360
+    pass_direction = None
+    if angle >= 315 or angle < 45:
+        pass_direction = 'forward'
+    elif angle < 135:
+        pass_direction = 'left'
+    elif angle < 225:
+        pass_direction = 'backward'
+    elif angle < 315:
+        pass_direction = 'right'
+
+    return {
+        'StartX_adj': start_x, 'StartY_adj': start_y, 'EndX_adj': end_x, 'EndY_adj': end_y,
+        'Distance': distance, 'Pass_Distance': pass_distance, 'Angle': angle, 'Pass_Direction': pass_direction,
+    }
+
+
+class StreamingCsvExporter:
+    """
+    리스트 위젯의 로그를 CSV 파일 하나에 스트리밍으로 기록합니다.
+
+    첫 기록 때 헤더와 전체 행을 쓰고, 이후에는 마지막 기록 이후에 추가된 행만 이어 붙입니다.
+    삭제/순서 변경이 있으면 바뀐 위치부터 파일 끝까지만 다시 씁니다.
+    각 행의 바이트 오프셋을 기억해 두었다가 해당 위치에서 truncate 합니다.
+    """
+
+    COORD_COLUMNS = ('StartX', 'StartY', 'EndX', 'EndY')
+
+    def __init__(self, file_path, roster=None, match_date=None):
+        self.file_path = file_path
+        self.roster = roster          # PlayerID / ReceiverID 를 채울 RosterRegistry
+        self.match_date = match_date
+        self.written_count = 0    # 파일에 기록된 행 수
+        self.row_offsets = []     # 각 행이 시작하는 바이트 위치
+        self.end_offset = 0       # 마지막으로 기록한 파일 끝 위치
+        self.id_inputs = None     # 기록 당시의 (MatchID, TeamID home, TeamID away)
+
+    def _format_row(self, record):
+        row = []
+        for col in ANALYZED_COLUMNS:
+            value = record.get(col, '')
+            if col in self.COORD_COLUMNS:
+                value = _to_float(value)
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                value = ''
+            row.append(value)
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(row)
+        return buffer.getvalue().encode('utf-8')
+
+    def _header_bytes(self):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(ANALYZED_COLUMNS)
+        # pandas 의 encoding="utf-8-sig" 와 동일하게 BOM 포함
+        return buffer.getvalue().encode('utf-8-sig')
+
+    def _write_from(self, start, logs, id_inputs):
+        match_id, teamid_h, teamid_a = id_inputs
+        chunks = []
+        offsets = self.row_offsets[:start]
+        if start == 0:
+            header = self._header_bytes()
+            chunks.append(header)
+            position = len(header)
+        else:
+            position = self.row_offsets[start] if start < len(self.row_offsets) else self.end_offset
+        write_at = position
+
+        for idx in range(start, len(logs)):
+            record = build_log_record(logs[idx], idx + 1, match_id, teamid_h, teamid_a,
+                                      self.roster, self.match_date)
+            record.update(analyze_pass_row(record))
+            line = self._format_row(record)
+            offsets.append(position)
+            chunks.append(line)
+            position += len(line)
+
+        mode = 'wb' if start == 0 else 'r+b'
+        with open(self.file_path, mode) as f:
+            if start > 0:
+                f.seek(write_at)
+                f.truncate()
+            f.write(b''.join(chunks))
+
+        self.row_offsets = offsets
+        self.written_count = len(logs)
+        self.end_offset = position
+        self.id_inputs = id_inputs
+
+    def sync(self, logs, id_inputs, dirty_from=None):
+        """
+        파일 내용을 logs 와 일치시킵니다.
+
+        Args:
+            logs (Sequence[str]): 현재 리스트 위젯의 로그 전체. 길이와 start 이후 행만 읽습니다.
+            id_inputs (tuple): (MatchID, TeamID home, TeamID away).
+            dirty_from (int | None): 삭제/순서 변경이 일어난 가장 앞 행 번호.
+                None 이면 새 행 추가만 있었던 것으로 간주합니다.
+        """
+        written = self.written_count
+        start = written
+        if dirty_from is not None:
+            start = min(start, dirty_from)
+        start = min(start, len(logs))
+
+        # 파일이 외부에서 바뀌었거나 ID 입력이 바뀌었으면 전체 다시 쓰기
+        if (written == 0 or id_inputs != self.id_inputs or not os.path.exists(self.file_path)
+                or os.path.getsize(self.file_path) != self.end_offset):
+            start = 0
+
+        if start == written and len(logs) == written:
+            return  # 변경 없음
+        self._write_from(start, logs, id_inputs)
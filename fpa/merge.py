@@ -0,0 +1,211 @@
+"""
+같은 경기(MatchID)를 여러 분석자 / 세션이 기록한 파일들을 하나의 로그로 합치기
+
+1. 정확한 중복: (전후반, 시간, 팀, 선수, 액션, 반올림 좌표) 를 정규화해 64비트 해시로 비교
+   (같은 파일 안의 같은 키는 같은 분에 실제로 여러 번 일어난 이벤트이므로, 파일마다 몇 번째 행인지까지
+    키에 넣어 1:1 로 짝지음. 결과에는 한 파일이 기록한 가장 많은 횟수만큼 남고 파일 순서와 관계없음)
+2. 근접 중복: 서로 다른 파일에서 같은 (전후반, 팀, 선수, 액션) 이 허용 시간 / 거리 안에 있으면 같은 이벤트
+   (뒤 파일의 행 하나는 앞 파일들에서 남은 행 하나와만 짝지어 버리고, 짝이 없는 행은 남김)
+   (그룹 + 시간 순으로 한 번 정렬한 뒤 허용 시간 안에 이어진 구간으로 나누고,
+    여러 파일의 행이 섞인 구간만 짝을 찾으므로 모든 쌍을 비교하지 않음)
+3. 남은 이벤트를 전후반 → 시간 순으로 정렬하고 No 를 1부터 다시 매김
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fpa.season import read_event_file
+from fpa.validation import normalize_jersey
+
+# 정확한 중복 판정에 쓰는 좌표 반올림 자릿수 (0.1m)
+KEY_COORD_DIGITS = 1
+# 근접 중복 허용 범위
+TIME_TOLERANCE = 2.0       # 초
+DISTANCE_TOLERANCE = 3.0   # m
+HALF_ORDER = {'1st': 0, '2nd': 1}
+MERGE_REPORT_COLUMNS = ['File', 'Events', 'Exact_Duplicates', 'Near_Duplicates', 'Kept']
+
+
+def time_to_seconds(series):
+    """
+    'MM:SS' 또는 'HH:mm:ss' 시간 문자열을 초 단위 실수로 변환합니다. (형식이 다르면 NaN)
+    고유값만 변환한 뒤 펼치므로 반복되는 시간 값이 많아도 빠릅니다.
+    """
+    codes, uniques = pd.factorize(series)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.strip().str.split(':', expand=True)
+    parts = parts.apply(pd.to_numeric, errors='coerce')
+    if parts.shape[1] == 2:
+        seconds = parts[0] * 60 + parts[1]
+    elif parts.shape[1] == 3:
+        # 두 칸짜리(MM:SS)는 마지막 칸이 비어 있음
+        seconds = np.where(parts[2].isna(), parts[0] * 60 + parts[1], parts[0] * 3600 + parts[1] * 60 + parts[2])
+    else:
+        seconds = np.full(len(parts), np.nan)
+    seconds = np.append(np.asarray(seconds, dtype=float), np.nan)
+    return pd.Series(seconds[codes], index=series.index)
+
+
+def _normalized_text(df, col):
+    if col not in df.columns:
+        return pd.Series('', index=df.index)
+    codes, uniques = pd.factorize(df[col])
+    uniques = pd.Series(uniques, dtype=object).astype(str).str.strip().str.lower().to_numpy(dtype=object)
+    return pd.Series(np.append(uniques, '')[codes], index=df.index)
+
+
+def read_match_events(file_path):
+    """ 파일 하나를 읽어 선수 번호를 정규화합니다. (병렬 읽기 단계) """
+    df = read_event_file(file_path)
+    for col in ('Player', 'Receiver'):
+        if col in df.columns:
+            df[col] = normalize_jersey(df[col])
+    return df
+
+
+def _near_duplicates(group, seconds, x, y, source, time_tolerance, distance_tolerance, claimed=()):
+    """
+    (그룹, 시간) 으로 정렬된 배열에서 근접 중복으로 버릴 행을 True 로 표시합니다.
+
+    같은 그룹에서 시간 간격이 허용 시간 이하로 이어진 구간마다, 파일 순서대로 각 행을
+    앞 파일들에서 남은 행 중 아직 짝이 없는 가장 이른 근접 행과 1:1 로 짝지어 버립니다.
+    (같은 파일 안의 연속 이벤트는 분석자가 따로 기록한 것이므로 서로 짝짓지 않음)
+    claimed 는 정확한 중복 단계에서 이미 짝지어진 (행 위치, 파일) 쌍으로, 그 파일의 다른 행과는 다시 짝짓지 않습니다.
+    """
+    n = len(group)
+    duplicate = np.zeros(n, dtype=bool)
+    if n == 0:
+        return duplicate
+    new_window = np.ones(n, dtype=bool)
+    new_window[1:] = (group[1:] != group[:-1]) | (seconds[1:] - seconds[:-1] > time_tolerance)
+    starts = np.flatnonzero(new_window)
+    ends = np.append(starts[1:], n)
+    # 한 파일의 행만 있는 구간은 짝지을 상대가 없으므로 건너뜀
+    mixed = np.minimum.reduceat(source, starts) != np.maximum.reduceat(source, starts)
+
+    claimed_by_source = {}
+    for row, file_source in claimed:
+        claimed_by_source.setdefault(file_source, set()).add(row)
+    seconds, x, y, source = seconds.tolist(), x.tolist(), y.tolist(), source.tolist()
+    for start, end in zip(starts[mixed].tolist(), ends[mixed].tolist()):
+        rows_by_source = {}
+        for i in range(start, end):
+            rows_by_source.setdefault(source[i], []).append(i)
+        kept = []  # 앞 파일들에서 남은 행 (시간 순)
+        for file_source in sorted(rows_by_source):
+            claimed_rows = claimed_by_source.get(file_source, ())
+            used = set()
+            added = []
+            for i in rows_by_source[file_source]:
+                for j in kept:
+                    if seconds[j] - seconds[i] > time_tolerance:
+                        break
+                    if j in used or j in claimed_rows or seconds[i] - seconds[j] > time_tolerance:
+                        continue
+                    both_missing = x[i] != x[i] and y[i] != y[i] and x[j] != x[j] and y[j] != y[j]
+                    if both_missing or math.hypot(x[i] - x[j], y[i] - y[j]) <= distance_tolerance:
+                        used.add(j)
+                        duplicate[i] = True
+                        break
+                if not duplicate[i]:
+                    added.append(i)
+            kept = sorted(kept + added, key=seconds.__getitem__)
+    return duplicate
+
+
+def merge_event_files(file_paths, match_id=None, time_tolerance=TIME_TOLERANCE,
+                      distance_tolerance=DISTANCE_TOLERANCE, max_workers=None):
+    """
+    같은 경기의 여러 이벤트 파일을 중복 없이 하나로 합칩니다.
+
+    Args:
+        file_paths (list[str]): 합칠 파일 경로 (xlsx / csv).
+        match_id (str | None): 이 MatchID 의 이벤트만 사용합니다. None 이면 파일들의 MatchID 가 하나여야 합니다.
+        time_tolerance (float): 근접 중복으로 볼 최대 시간 차이(초).
+        distance_tolerance (float): 근접 중복으로 볼 최대 시작 위치 거리(m).
+        max_workers (int | None): 파일 읽기 프로세스 수. 1 이면 현재 프로세스에서 순차 처리합니다.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (전후반 → 시간 순으로 정렬되고 No 가 다시 매겨진 이벤트,
+                                            파일별 File / Events / Exact_Duplicates / Near_Duplicates / Kept 보고서)
+    """
+    file_paths = list(file_paths)
+    if max_workers == 1 or len(file_paths) <= 1:
+        frames = [read_match_events(path) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(read_match_events, file_paths))
+
+    for source, df in enumerate(frames):
+        df['_source'] = source
+        df['_row'] = np.arange(len(df))
+    events = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+    if events.empty:
+        return events, pd.DataFrame(columns=MERGE_REPORT_COLUMNS)
+
+    if 'MatchID' in events.columns:
+        match_ids = events['MatchID'].dropna().astype(str).str.strip()
+        match_ids = match_ids[match_ids != '']
+        if match_id is None:
+            if match_ids.nunique() > 1:
+                raise ValueError(f"파일들의 MatchID 가 여러 개입니다: {', '.join(sorted(match_ids.unique()))}")
+        else:
+            keep = events['MatchID'].isna() | (events['MatchID'].astype(str).str.strip().isin([str(match_id), '']))
+            events = events[keep].reset_index(drop=True)
+        if match_id is None and not match_ids.empty:
+            match_id = match_ids.iloc[0]
+
+    seconds = time_to_seconds(events['Time']) if 'Time' in events.columns else pd.Series(np.nan, index=events.index)
+    x = pd.to_numeric(events['StartX'], errors='coerce') if 'StartX' in events.columns else seconds * np.nan
+    y = pd.to_numeric(events['StartY'], errors='coerce') if 'StartY' in events.columns else seconds * np.nan
+    half = _normalized_text(events, 'Half')
+    team = _normalized_text(events, 'Team')
+    action = _normalized_text(events, 'Action')
+    player = events['Player'].fillna('').astype(str) if 'Player' in events.columns else pd.Series('', index=events.index)
+
+    # 1. 정확한 중복: (키 해시, 그 파일 안에서 몇 번째인지) 가 먼저 불러온 다른 파일에 있으면 버림
+    #    (A 가 1번, B 가 2번 기록한 이벤트는 파일 순서와 관계없이 2번 남음)
+    keys = pd.DataFrame({'Half': half, 'Time': seconds, 'Team': team, 'Player': player, 'Action': action,
+                         'X': x.round(KEY_COORD_DIGITS), 'Y': y.round(KEY_COORD_DIGITS)})
+    key_hash = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    sources = events['_source']
+    occurrence = sources.groupby([sources.to_numpy(), key_hash]).cumcount().to_numpy()
+    # 같은 키 / 순번의 가장 앞 파일 행과 짝지음 (자기 자신이 그 행이 아니면 정확한 중복)
+    partner = sources.groupby([key_hash, occurrence]).transform('idxmin').to_numpy()
+    exact = partner != np.arange(len(events))
+
+    # 2. 근접 중복: (전후반, 팀, 선수, 액션) 그룹 + 시간 순으로 정렬해 이웃 행만 비교
+    remaining = np.flatnonzero(~exact & ~np.isnan(seconds.to_numpy()))
+    group = keys[['Half', 'Team', 'Player', 'Action']].iloc[remaining]
+    group_codes = pd.util.hash_pandas_object(group, index=False).to_numpy()
+    order = np.lexsort((events['_source'].to_numpy()[remaining], seconds.to_numpy()[remaining], group_codes))
+    sorted_rows = remaining[order]
+    position = np.full(len(events), -1)
+    position[sorted_rows] = np.arange(len(sorted_rows))
+    exact_rows = np.flatnonzero(exact)
+    claimed = set(zip(position[partner[exact_rows]].tolist(), sources.to_numpy()[exact_rows].tolist()))
+    near = np.zeros(len(events), dtype=bool)
+    near[sorted_rows] = _near_duplicates(
+        group_codes[order], seconds.to_numpy()[sorted_rows], x.to_numpy(dtype=float)[sorted_rows],
+        y.to_numpy(dtype=float)[sorted_rows], events['_source'].to_numpy()[sorted_rows],
+        time_tolerance, distance_tolerance, claimed)
+
+    # 3. 전후반 → 시간 → 파일 순서로 정렬하고 번호를 다시 매김
+    drop = exact | near
+    report = pd.DataFrame({
+        'File': file_paths,
+        'Events': np.bincount(events['_source'], minlength=len(file_paths)),
+        'Exact_Duplicates': np.bincount(events['_source'], weights=exact, minlength=len(file_paths)).astype(int),
+        'Near_Duplicates': np.bincount(events['_source'], weights=near, minlength=len(file_paths)).astype(int),
+    })
+    report['Kept'] = report['Events'] - report['Exact_Duplicates'] - report['Near_Duplicates']
+
+    merged = events.assign(_half=half.map(HALF_ORDER).fillna(len(HALF_ORDER)), _seconds=seconds)[~drop]
+    merged = merged.sort_values(['_half', '_seconds', '_source', '_row'], kind='stable', na_position='last')
+    merged = merged.drop(columns=['_source', '_row', '_half', '_seconds']).reset_index(drop=True)
+    merged['No'] = np.arange(1, len(merged) + 1)
+    if match_id is not None:
+        merged['MatchID'] = match_id
+    front = [col for col in ('No', 'MatchID') if col in merged.columns]
+    return merged[front + [col for col in merged.columns if col not in front]], report
@@ -0,0 +1,51 @@
+"""
+경기장 좌표 변환 (장면 픽셀 ↔ 미터, 표준 라이브러리만 사용)
+
+필드 이미지가 놓인 사각형(장면 좌표)과 실제 경기장(105 x 68 m)을 잇는 변환을 한 번만 계산해 두고
+클릭 입력, 리포트 그리기 등 모든 곳에서 같은 변환을 사용합니다.
+창 크기 / 확대 배율은 QGraphicsView 의 뷰 변환이 처리하므로 이 변환은 화면 해상도와 무관합니다.
+"""
+from fpa.constants import FIELD_W, FIELD_H
+
+# 로그에 기록하는 미터 좌표 소수 자릿수 (1cm)
+COORD_DIGITS = 2
+
+
+class PitchTransform:
+    """
+    장면(픽셀) 좌표와 미터 좌표 사이의 정방향 / 역방향 변환.
+    미터 좌표의 y 는 아래에서 위로 증가합니다. (on_field_click 이후 로그 좌표와 같은 방향)
+
+    to_metres / to_scene 은 숫자 대신 numpy 배열도 그대로 받을 수 있습니다. (clamp=False 일 때)
+    """
+
+    def __init__(self, width, height, left=0.0, top=0.0, field_w=FIELD_W, field_h=FIELD_H):
+        if width <= 0 or height <= 0:
+            raise ValueError(f"필드 크기가 올바르지 않습니다: {width} x {height}")
+        self.left, self.top = left, top
+        self.width, self.height = width, height
+        self.field_w, self.field_h = field_w, field_h
+        # 변환마다 나눗셈을 하지 않도록 배율을 미리 계산
+        self._x_scale = field_w / width
+        self._y_scale = field_h / height
+        self._x_inverse = width / field_w
+        self._y_inverse = height / field_h
+        self._bottom = top + height
+
+    def to_metres(self, x, y, clamp=True):
+        """ 장면 좌표 → 미터 좌표. clamp 이면 필드 밖 클릭을 경계로 보정합니다. """
+        x_meter = (x - self.left) * self._x_scale
+        y_meter = (self._bottom - y) * self._y_scale
+        if clamp:
+            x_meter = min(max(x_meter, 0.0), self.field_w)
+            y_meter = min(max(y_meter, 0.0), self.field_h)
+        return x_meter, y_meter
+
+    def to_scene(self, x_meter, y_meter):
+        """ 미터 좌표 → 장면 좌표 """
+        return self.left + x_meter * self._x_inverse, self._bottom - y_meter * self._y_inverse
+
+    def to_log_position(self, x, y):
+        """ 장면 좌표 → 로그에 기록할 반올림된 미터 좌표 """
+        x_meter, y_meter = self.to_metres(x, y)
+        return round(x_meter, COORD_DIGITS), round(y_meter, COORD_DIGITS)
@@ -0,0 +1,297 @@
+"""
+선수 명단(roster) 레지스트리: (TeamID, 등번호, 기간) → 정수 PlayerID
+
+같은 등번호라도 팀이나 기간이 다르면 다른 선수이므로, 모든 요약과 시즌 집계는
+로그의 등번호 문자열 대신 이 레지스트리가 부여한 정수 PlayerID 를 기준으로 합니다.
+
+명단 파일(CSV) 컬럼: PlayerID, TeamID, Number, Name, Position, ValidFrom, ValidTo
+(ValidFrom / ValidTo 는 'YYYY-MM-DD', 비어 있으면 기간 제한 없음)
+
+한 건씩 찾을 때는 딕셔너리로 O(1), 데이터프레임 전체를 찾을 때는 (팀, 등번호) 를 정수 키로 바꿔
+정렬된 배열에서 searchsorted 로 한 번에 찾습니다. 단건 조회는 표준 라이브러리만 사용합니다.
+"""
+import csv
+import os
+import threading
+import zlib
+
+ROSTER_COLUMNS = ['PlayerID', 'TeamID', 'Number', 'Name', 'Position', 'ValidFrom', 'ValidTo']
+MIN_DATE = '0001-01-01'
+MAX_DATE = '9999-12-31'
+UNKNOWN_PLAYER_ID = -1
+# 정수 키 = 팀 번호 * JERSEY_SPACE + 등번호
+JERSEY_SPACE = 1000
+
+
+def _team_key(team_id):
+    # 빈 값이 섞인 컬럼에서 읽힌 101.0 같은 실수 ID 는 '101' 로 통일
+    if team_id is None or team_id != team_id:
+        return ''
+    if isinstance(team_id, float) and team_id.is_integer():
+        team_id = int(team_id)
+    return str(team_id).strip()
+
+
+def _jersey(number):
+    # 10 / 10.0 / '10' → 10, 변환할 수 없으면 None
+    try:
+        value = float(number)
+    except (TypeError, ValueError):
+        return None
+    if value != value or value != int(value) or not 0 <= value < JERSEY_SPACE:
+        return None
+    return int(value)
+
+
+class RosterRegistry:
+    """
+    (TeamID, 등번호, 기간) → PlayerID 레지스트리.
+
+    resolve(..., register=True) 로 명단에 없는 선수를 찾으면 새 PlayerID 를 부여해 등록합니다.
+    날짜와 함께 등록하면 그 날짜부터 유효한 기간으로 등록하므로, 같은 등번호의 이전 기간 선수는 그대로 남습니다.
+    기간이 겹치면 가장 늦게 시작한 기간의 선수를 사용합니다.
+    save() 로 저장해 두면 다음 경기에서도 같은 PlayerID 가 유지됩니다.
+
+    GUI 스레드가 선수를 등록하는 동안 통계 서버 스레드가 조회할 수 있으므로
+    명단을 읽고 쓰는 부분은 모두 _lock 안에서 처리합니다. (정렬 배열은 만든 뒤 바뀌지 않으므로 잠금 밖에서 사용)
+    """
+
+    def __init__(self, entries=None):
+        self.entries = []   # ROSTER_COLUMNS 딕셔너리 목록
+        self._index = {}    # (TeamID, 등번호) → [(ValidFrom, ValidTo, PlayerID), ...]
+        self._next_id = 1
+        self._arrays = None  # resolve_frame 용 정렬 배열 (등록 시 무효화)
+        self._lock = threading.RLock()
+        for entry in entries or []:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            return cls(list(csv.DictReader(f)))
+
+    def save(self, file_path):
+        with self._lock:
+            entries = list(self.entries)
+        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=ROSTER_COLUMNS)
+            writer.writeheader()
+            writer.writerows(entries)
+
+    def add(self, entry):
+        """ 명단 항목 하나를 추가하고 PlayerID 를 반환합니다. PlayerID 가 없으면 새로 부여합니다. """
+        number = _jersey(entry.get('Number'))
+        if number is None:
+            raise ValueError(f"등번호가 올바르지 않습니다: {entry.get('Number')!r}")
+        row = {col: entry.get(col, '') or '' for col in ROSTER_COLUMNS}
+        with self._lock:
+            player_id = entry.get('PlayerID')
+            player_id = int(player_id) if str(player_id or '').strip() else self._next_id
+            self._next_id = max(self._next_id, player_id + 1)
+
+            row.update(PlayerID=player_id, TeamID=_team_key(entry.get('TeamID')), Number=number,
+                       ValidFrom=row['ValidFrom'] or MIN_DATE, ValidTo=row['ValidTo'] or MAX_DATE)
+            self.entries.append(row)
+            periods = self._index.setdefault((row['TeamID'], number), [])
+            periods.append((row['ValidFrom'], row['ValidTo'], player_id))
+            periods.sort()
+            self._arrays = None
+        return player_id
+
+    def resolve(self, team_id, number, date=None, register=False):
+        """
+        (TeamID, 등번호, 날짜) 의 PlayerID 를 반환합니다.
+
+        Args:
+            date (str | None): 'YYYY-MM-DD'. None 이면 기간과 관계없이 가장 최근 항목을 사용합니다.
+                여러 기간에 걸치면 가장 늦게 시작한 기간을 사용합니다.
+            register (bool): 명단에 없으면 (해당 날짜를 포함하는 기간이 없으면) 새 PlayerID 로 등록할지 여부.
+                date 가 있으면 ValidFrom=date 로 등록합니다.
+
+        Returns:
+            int: PlayerID. 찾지 못했거나 등번호 / TeamID 가 비어 있으면 UNKNOWN_PLAYER_ID (-1).
+            (TeamID 가 없으면 홈 / 원정 선수를 구분할 수 없으므로 찾지도 등록하지도 않음)
+        """
+        jersey = _jersey(number)
+        team = _team_key(team_id)
+        if jersey is None or not team:
+            return UNKNOWN_PLAYER_ID
+        with self._lock:
+            periods = self._index.get((team, jersey))
+            if periods:
+                if date is None:
+                    return periods[-1][2]
+                for valid_from, valid_to, player_id in reversed(periods):
+                    if valid_from <= date <= valid_to:
+                        return player_id
+            if not register:
+                return UNKNOWN_PLAYER_ID
+            return self.add({'TeamID': team, 'Number': jersey, 'ValidFrom': date or ''})
+
+    def _sorted_arrays(self):
+        # 한 번 만든 배열은 바꾸지 않고, 등록 시 새로 만듦 (다른 스레드가 쓰던 배열은 그대로 유효)
+        import numpy as np
+
+        with self._lock:
+            if self._arrays is None:
+                teams = sorted({team for team, _ in self._index})
+                team_codes = {team: code for code, team in enumerate(teams)}
+                rows = sorted((team_codes[team] * JERSEY_SPACE + number, valid_from, valid_to, player_id)
+                              for (team, number), periods in self._index.items()
+                              for valid_from, valid_to, player_id in periods)
+                self._arrays = (
+                    teams,
+                    np.array([r[0] for r in rows], dtype=np.int64),
+                    np.array([r[1] for r in rows], dtype='datetime64[D]'),
+                    np.array([r[2] for r in rows], dtype='datetime64[D]'),
+                    np.array([r[3] for r in rows], dtype=np.int64),
+                )
+            return self._arrays
+
+    def resolve_frame(self, df, number_col='Player', team_col='TeamID', date=None, date_col=None, register=False):
+        """
+        데이터프레임 전체의 PlayerID 를 정수 배열 연산으로 한 번에 찾습니다.
+
+        (TeamID, 등번호) 를 정수 키로 바꾼 뒤 정렬된 명단 키 배열에서 searchsorted 로 위치를 찾고,
+        기간이 여러 개인 키만 행 단위로 다시 확인합니다.
+
+        Args:
+            df (pd.DataFrame): 이벤트 데이터프레임.
+            number_col (str): 등번호 컬럼 ('Player' 또는 'Receiver').
+            team_col (str): 팀 ID 컬럼.
+            date (str | None): 모든 행에 적용할 날짜 'YYYY-MM-DD'.
+            date_col (str | None): 행별 날짜 컬럼 (date 보다 우선).
+            register (bool): 해당 날짜의 선수를 찾지 못한 (팀, 등번호) 를 resolve 와 같은 방식으로 등록할지 여부.
+
+        Returns:
+            np.ndarray: int64 PlayerID 배열 (찾지 못했거나 TeamID 가 비어 있으면 -1).
+        """
+        import numpy as np
+        import pandas as pd
+
+        if df.empty or number_col not in df.columns:
+            return np.full(len(df), UNKNOWN_PLAYER_ID, dtype=np.int64)
+
+        # 등번호 / 팀 컬럼은 반복 값이 많으므로 고유값만 변환한 뒤 코드 배열로 펼침
+        number_codes, number_uniques = pd.factorize(df[number_col])
+        numbers = pd.to_numeric(pd.Series(number_uniques, dtype=object), errors='coerce')
+        valid_number = numbers.notna() & (numbers == numbers.round()) & (numbers >= 0) & (numbers < JERSEY_SPACE)
+        numbers = np.append(numbers.where(valid_number, -1).to_numpy(dtype=np.int64), -1)[number_codes]
+        team_column = df[team_col] if team_col in df.columns else pd.Series('', index=df.index)
+        team_codes, team_uniques = pd.factorize(team_column)
+        team_uniques = pd.Index([_team_key(team) for team in team_uniques], dtype=object)
+        team_values = np.append(team_uniques.to_numpy(dtype=object), '')[team_codes]
+
+        if date_col is not None and date_col in df.columns:
+            dates = pd.to_datetime(df[date_col], errors='coerce').to_numpy(dtype='datetime64[D]')
+        elif date is not None:
+            dates = np.full(len(df), np.datetime64(date, 'D'))
+        else:
+            dates = np.full(len(df), np.datetime64('NaT', 'D'))
+
+        result = self._lookup(team_uniques, team_codes, team_values, numbers, dates)
+        missing = (result == UNKNOWN_PLAYER_ID) & (numbers >= 0) & (team_values != '')
+        if register and missing.any():
+            # 찾지 못한 (팀, 등번호, 날짜) 조합만 날짜 순으로 resolve 와 같은 방식으로 등록한 뒤 다시 조회
+            # (이른 날짜부터 등록해야 한 번 등록한 기간이 같은 선수의 이후 날짜도 포함함)
+            pairs = pd.DataFrame({'team': team_values[missing], 'number': numbers[missing],
+                                  'date': dates[missing]}).drop_duplicates()
+            with self._lock:
+                for team, number, day in pairs.sort_values('date', na_position='first').itertuples(index=False):
+                    self.resolve(team, number, None if pd.isna(day) else str(day.date()), register=True)
+            result = self._lookup(team_uniques, team_codes, team_values, numbers, dates)
+        return result
+
+    def _lookup(self, team_uniques, team_codes, team_values, numbers, dates):
+        import numpy as np
+        import pandas as pd
+
+        if not self._index:
+            return np.full(len(numbers), UNKNOWN_PLAYER_ID, dtype=np.int64)
+        # 이후 계산은 이 시점의 배열만 사용하므로 잠금 밖에서 다른 스레드가 등록해도 영향 없음
+        teams, keys, valid_from, valid_to, player_ids = self._sorted_arrays()
+
+        team_codes = np.append(pd.Index(teams).get_indexer(team_uniques), -1)[team_codes]
+        valid = (team_codes >= 0) & (numbers >= 0) & (team_values != '')
+        event_keys = np.where(valid, team_codes.astype(np.int64) * JERSEY_SPACE + numbers, -1)
+        no_date = np.isnat(dates)
+
+        left = np.searchsorted(keys, event_keys, side='left')
+        right = np.searchsorted(keys, event_keys, side='right')
+        count = np.where(valid, right - left, 0)
+        result = np.full(len(numbers), UNKNOWN_PLAYER_ID, dtype=np.int64)
+
+        # 대부분의 키는 기간이 하나뿐이므로 배열 연산으로 처리
+        single = count == 1
+        candidates = left[single]
+        in_period = no_date[single] | ((valid_from[candidates] <= dates[single]) &
+                                       (dates[single] <= valid_to[candidates]))
+        result[np.flatnonzero(single)[in_period]] = player_ids[candidates[in_period]]
+
+        # 같은 (팀, 등번호) 에 기간이 여러 개인 경우만 행 단위로 확인
+        # (기간은 시작일 순으로 정렬되어 있으므로 날짜를 포함하는 마지막 기간 = 가장 늦게 시작한 기간)
+        for row in np.flatnonzero(count > 1):
+            lo, hi = left[row], right[row]
+            if no_date[row]:
+                result[row] = player_ids[hi - 1]
+                continue
+            inside = np.flatnonzero((valid_from[lo:hi] <= dates[row]) & (dates[row] <= valid_to[lo:hi]))
+            if inside.size:
+                result[row] = player_ids[lo + inside[-1]]
+        return result
+
+    def players(self):
+        """ 명단을 PlayerID 인덱스의 데이터프레임으로 반환합니다. (요약 결과에 이름/포지션을 붙일 때 사용) """
+        import pandas as pd
+
+        with self._lock:
+            entries = list(self.entries)
+        return pd.DataFrame(entries, columns=ROSTER_COLUMNS).drop_duplicates('PlayerID', keep='last') \
+            .set_index('PlayerID')
+
+
+def provisional_player_ids(df, number_col='Player', team_col='TeamID', side_col='Team'):
+    """
+    명단에서 찾지 못한 선수에게 줄 임시 PlayerID (-2 이하의 음수) 배열을 반환합니다.
+
+    (팀, 등번호) 의 CRC32 로 정하므로 경기 / 프로세스가 달라도 같은 선수는 같은 값이 되고,
+    서로 다른 선수가 -1 하나로 합쳐지지 않습니다. TeamID 가 비어 있으면 Team(home / away) 으로 구분합니다.
+    등번호가 없는 행은 UNKNOWN_PLAYER_ID (-1) 입니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if df.empty or number_col not in df.columns:
+        return np.full(len(df), UNKNOWN_PLAYER_ID, dtype=np.int64)
+    numbers = df[number_col].map(_jersey)
+    teams = df[team_col].map(_team_key) if team_col in df.columns else pd.Series('', index=df.index)
+    if side_col in df.columns:
+        sides = 'side:' + df[side_col].astype(str).str.strip().str.lower()
+        teams = teams.where(teams != '', sides)
+    keys = teams.astype(str) + '|' + numbers.astype(str)
+    codes, uniques = pd.factorize(keys)
+    provisional = np.array([-2 - zlib.crc32(key.encode('utf-8')) for key in uniques], dtype=np.int64)
+    result = provisional[codes]
+    result[numbers.isna().to_numpy()] = UNKNOWN_PLAYER_ID
+    return result
+
+
+def fill_player_ids(df, id_col='PlayerID', number_col='Player', team_col='TeamID'):
+    """ id_col 의 빈 값 / -1 을 provisional_player_ids 로 채운 int64 PlayerID 배열을 반환합니다. """
+    import pandas as pd
+
+    player_ids = pd.to_numeric(df[id_col], errors='coerce') if id_col in df.columns \
+        else pd.Series(float('nan'), index=df.index)
+    unresolved = (player_ids.isna() | (player_ids < 0)).to_numpy()
+    result = player_ids.fillna(UNKNOWN_PLAYER_ID).to_numpy(dtype='int64', copy=True)
+    if unresolved.any():
+        result[unresolved] = provisional_player_ids(df[unresolved], number_col, team_col)
+    return result
+
+
+def default_roster_path(data_dir=None):
+    """ 앱이 사용하는 기본 명단 파일 경로 (data_dir, 없으면 작업 폴더의 roster.csv) """
+    return os.path.join(data_dir or os.path.abspath("."), "roster.csv")
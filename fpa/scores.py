@@ -0,0 +1,146 @@
+"""
+요약 통계로부터 1~100점 스탯 점수 계산
+"""
+import numpy as np
+
+
+def calculate_pass_score(df_summary):
+    """
+    선수별 요약 통계로부터 패스 점수를 계산합니다. (절대평가 버전)
+    """
+    if df_summary.empty:
+        return df_summary
+
+    # 1. 항목별 점수 계산
+    df_summary['Accuracy_Score'] = df_summary['Pass_Success_Rate'] * 0.5
+    df_summary['Influence_Score'] = (df_summary['forward'] / df_summary['Total_Pass']).fillna(0) * 30
+    df_summary['Creativity_Score'] = (df_summary['Key_Pass'] * 2) + (df_summary['Assist'] * 5)
+    df_summary['Volume_Bonus'] = np.log1p(df_summary['Success_Pass']) * 3
+
+    # 2. Raw 점수 합산
+    df_summary['Raw_Score'] = (df_summary['Accuracy_Score'] +
+                               df_summary['Influence_Score'] +
+                               df_summary['Creativity_Score'] +
+                               df_summary['Volume_Bonus'])
+
+    # ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
+    # 3. (수정) Sigmoid 함수를 이용해 1~100점 절대 점수로 변환
+
+    # --- 여기서 기준점을 설정할 수 있습니다 ---
+    mid_point = 50  # Raw_Score가 50점일 때 Pass_Score 50점이 되는 기준점
+    steepness = 0.1  # 곡선의 기울기 (숫자가 클수록 가파름)
+
+    # 시그모이드 함수 계산
+    raw_scores = df_summary['Raw_Score']
+    pass_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
+
+    df_summary['Pass_Score'] = pass_scores.round(0).astype(int)
+    # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
+
+    return df_summary
+
+
+def calculate_shooting_score(df_shooter_summary):
+    """
+    선수별 슈팅 요약 통계로부터 슈팅 점수를 계산합니다. (태그 보너스 추가)
+    """
+    summary = df_shooter_summary.copy()
+    if summary.empty:
+        return summary
+
+    # 1. 기본 점수 계산
+    finishing_score = (summary['Goals'] - summary['Total_xG']) * 15
+    threat_score = summary['Total_xG'] * 20
+
+    # ▼▼▼▼▼ (추가된 부분) 태그 기반 보너스 점수 계산 ▼▼▼▼▼
+    # 헤더 골은 1골당 3점, 박스 밖 골은 1골당 5점의 보너스
+    headed_bonus = summary.get('Headed_Goals', 0) * 3
+    outbox_bonus = summary.get('Outbox_Gals', 0) * 5  # Outbox_Goals
+
+    summary['Specialty_Bonus'] = headed_bonus + outbox_bonus
+    # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
+
+    summary['Raw_Shooting_Score'] = finishing_score + threat_score + summary['Specialty_Bonus']
+
+    # 2. Sigmoid 함수로 1~100점 변환
+    mid_point = 10
+    steepness = 0.15
+    raw_scores = summary['Raw_Shooting_Score']
+    shooting_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
+
+    summary['Shooting_Score'] = shooting_scores.round(0).astype(int)
+    return summary
+
+def calculate_cross_score(df_cross_summary):
+    """
+    선수별 크로스 요약 통계로부터 CRO 스탯 점수를 계산합니다.
+    """
+    summary = df_cross_summary.copy()
+    if summary.empty:
+        return summary
+
+    # Raw Score 계산: (정확도 * 70%) + (성공 횟수 보너스)
+    accuracy_score = summary['Cross_Accuracy'] * 0.7
+    volume_bonus = np.log1p(summary['Successful_Crosses']) * 3
+    summary['Raw_Cross_Score'] = accuracy_score + volume_bonus
+
+    # Sigmoid 함수로 1~100점 변환
+    mid_point = 40  # Raw Score 40점을 평균(50점)으로 설정
+    steepness = 0.1
+    raw_scores = summary['Raw_Cross_Score']
+    cross_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
+
+    summary['Cross_Score'] = cross_scores.round(0).astype(int)
+    return summary
+
+def calculate_tackle_score(df_tackle_summary):
+    """
+    선수별 태클 요약 통계로부터 TAC 스탯 점수를 계산합니다.
+    """
+    summary = df_tackle_summary.copy()
+    if summary.empty:
+        return summary
+
+    # Raw Score 계산: (성공률 * 60%) + (성공 횟수 보너스)
+    accuracy_score = summary['Tackle_Success_Rate'] * 0.6
+    volume_bonus = np.log1p(summary['Successful_Tackles']) * 4
+    summary['Raw_Tackle_Score'] = accuracy_score + volume_bonus
+
+    # Sigmoid 함수로 1~100점 변환
+    mid_point = 50  # Raw Score 50점을 평균(50점)으로 설정
+    steepness = 0.1
+    raw_scores = summary['Raw_Tackle_Score']
+    tackle_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
+
+    summary['Tackle_Score'] = tackle_scores.round(0).astype(int)
+    return summary
+
+
+def calculate_heading_score(df_heading_summary):
+    """
+    선수별 헤딩 요약 통계로부터 HED 스탯 점수를 계산합니다.
+    """
+    summary = df_heading_summary.copy()
+    if summary.empty:
+        return summary
+
+    # 필요한 컬럼이 없을 경우 0으로 채우기
+    required_cols = ['Aerial_Duel_Success_Rate', 'Headed_SOT_Rate', 'Aerial_Duels_Won']
+    for col in required_cols:
+        if col not in summary.columns:
+            summary[col] = 0
+
+    # Raw Score 계산: (공중볼 성공률 * 50%) + (헤딩 유효슛 비율 * 30%) + (공중볼 성공 횟수 보너스)
+    aerial_score = summary['Aerial_Duel_Success_Rate'] * 0.5
+    shot_score = summary['Headed_SOT_Rate'] * 0.3
+    volume_bonus = np.log1p(summary['Aerial_Duels_Won']) * 2
+    summary['Raw_Heading_Score'] = aerial_score + shot_score + volume_bonus
+
+    # Sigmoid 함수로 1~100점 변환
+    mid_point = 45
+    steepness = 0.1
+    raw_scores = summary['Raw_Heading_Score']
+    heading_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
+
+    summary['Heading_Score'] = heading_scores.round(0).astype(int)
+    return summary
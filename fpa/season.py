@@ -0,0 +1,117 @@
+"""
+여러 경기 파일의 시즌 집계 (map-reduce)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from fpa.analysis import analyze_pass_data
+from fpa.roster import RosterRegistry, fill_player_ids
+from fpa.summary import (
+    create_match_partials, merge_partials, derive_pass_summary, derive_shooter_summary,
+    derive_cross_summary, derive_tackle_summary, derive_heading_summary, score_summaries)
+from fpa.validation import normalize_jersey
+from fpa.xg import add_xg_to_data
+
+
+def read_event_file(file_path):
+    """
+    이벤트 파일(xlsx / csv)을 읽습니다. xlsx 는 'Data' 또는 export_log 가 쓰는 'Analyzed_Data' 시트를 사용합니다.
+    """
+    if file_path.endswith('.xlsx'):
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        df = sheets.get('Data', sheets.get('Analyzed_Data'))
+        if df is None:
+            raise ValueError(f"'Data' 또는 'Analyzed_Data' 시트가 없습니다: {file_path}")
+        return df
+    return pd.read_csv(file_path)
+
+
+# 작업 프로세스마다 명단 파일을 한 번만 읽어 색인해 둠 (경로 → RosterRegistry)
+_ROSTERS = {}
+
+
+def load_roster(roster_path):
+    """ 명단 파일을 읽어 캐시합니다. 같은 프로세스에서 같은 경로는 다시 읽지 않습니다. """
+    if roster_path not in _ROSTERS:
+        _ROSTERS[roster_path] = RosterRegistry.load(roster_path)
+    return _ROSTERS[roster_path]
+
+
+def load_match_data(file_path, roster_path=None, match_date=None):
+    """
+    내보낸 경기 파일(xlsx / csv)을 읽어 분석 컬럼과 xG 가 포함된 데이터프레임으로 반환합니다.
+
+    roster_path 가 주어지면 PlayerID / ReceiverID 가 비어 있는 행만 명단에서 찾습니다.
+    파일에 기록된 ID 는 저장 당시 경기 날짜 기준으로 찾은 값이므로, 나중에 등번호가 다른 선수에게
+    넘어가도 바뀌지 않도록 그대로 둡니다. 명단 기간은 파일의 Date 컬럼, 없으면 match_date 기준입니다.
+    (여러 프로세스가 동시에 번호를 부여하지 않도록 새 선수는 등록하지 않고 -1 로 둡니다)
+    """
+    df = read_event_file(file_path)
+    for col in ('Player', 'Receiver'):
+        if col in df.columns:
+            df[col] = normalize_jersey(df[col])
+    if roster_path is not None:
+        roster = load_roster(roster_path)
+        date_col = 'Date' if 'Date' in df.columns else None
+        for number_col, id_col in (('Player', 'PlayerID'), ('Receiver', 'ReceiverID')):
+            if number_col not in df.columns:
+                continue
+            ids = pd.to_numeric(df[id_col], errors='coerce').astype(float) if id_col in df.columns \
+                else pd.Series(float('nan'), index=df.index)
+            missing = ids.isna() | (ids < 0)
+            if missing.any():
+                ids[missing] = roster.resolve_frame(df[missing], number_col, date=match_date, date_col=date_col)
+            df[id_col] = ids.where(ids >= 0)
+        if 'PlayerID' in df.columns:
+            df['PlayerID'] = df['PlayerID'].fillna(-1).astype('int64')
+    if 'Pass_Direction' not in df.columns:
+        df = analyze_pass_data(df)
+    if 'xG' not in df.columns:
+        df = add_xg_to_data(df)
+    return df
+
+
+def load_match_partials(file_path, roster_path=None):
+    """ 경기 파일 하나를 PlayerID 기준 부분 집계로 변환합니다. (map 단계) """
+    df = load_match_data(file_path, roster_path)
+    if 'PlayerID' not in df.columns:
+        raise ValueError(f"PlayerID 컬럼이 없습니다. 명단 파일(roster)을 함께 지정하세요: {file_path}")
+    # 명단에 없는 선수는 (팀, 등번호) 별 음수 임시 ID 로 구분 (-1 하나로 합치지 않음)
+    df['PlayerID'] = fill_player_ids(df)
+    return create_match_partials(df)
+
+
+def aggregate_season(file_paths, max_workers=None, season_partials=None, roster_path=None):
+    """
+    여러 경기 파일의 부분 집계를 프로세스 풀에서 병렬로 만든 뒤 하나로 합칩니다.
+
+    Args:
+        file_paths (list[str]): 경기 파일 경로 목록.
+        max_workers (int | None): 프로세스 수. 1 이면 현재 프로세스에서 순차 처리합니다.
+        season_partials (pd.DataFrame | None): 기존 시즌 누계. 주어지면 새 경기만 더합니다.
+        roster_path (str | None): 명단 파일. 주어지면 파일에 PlayerID 가 없는 행만 명단에서 찾습니다.
+
+    Returns:
+        pd.DataFrame: 합쳐진 PlayerID 기준 부분 집계.
+            (명단에서 찾지 못한 선수는 (팀, 등번호) 별 음수 임시 PlayerID)
+    """
+    file_paths = list(file_paths)
+    load = partial(load_match_partials, roster_path=roster_path)
+    if max_workers == 1 or len(file_paths) <= 1:
+        partials = [load(path) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            partials = list(executor.map(load, file_paths))
+    return merge_partials([season_partials] + partials)
+
+
+def create_season_summaries(season_partials):
+    """
+    합쳐진 부분 집계로부터 비율과 점수를 계산해 시트 이름별 데이터프레임으로 반환합니다.
+    (export_log 의 Excel 시트 구성과 동일한 이름 사용)
+    """
+    return score_summaries(derive_pass_summary(season_partials), derive_shooter_summary(season_partials),
+                           derive_cross_summary(season_partials), derive_tackle_summary(season_partials),
+                           derive_heading_summary(season_partials))
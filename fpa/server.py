@@ -0,0 +1,410 @@
+"""
+현재 경기의 읽기 전용 실시간 통계 서버 (asyncio HTTP / WebSocket, 표준 라이브러리만 사용)
+
+벤치 태블릿이나 중계 그래픽 PC 가 수집 PC 의 파일을 건드리지 않고 실시간 기록을 읽을 수 있도록
+별도 스레드의 이벤트 루프에서 동작합니다. GUI 스레드는 publish_* 로 변경 내용만 넘기고 바로 돌아오며,
+레코드 변환 / JSON 직렬화 / 요약 계산 / 전송은 모두 서버 스레드(요약은 작업 스레드)에서 처리합니다.
+
+HTTP (GET 만 허용)
+    /events   전체 이벤트 레코드
+    /score    팀별 득점 (home / away)
+    /summary  선수별 요약과 점수 (export_log 의 Excel 시트와 같은 이름)
+WebSocket
+    /ws       접속 시 snapshot 한 번, 이후 insert / remove / reset 변경분을 푸시
+
+기본은 이 PC(127.0.0.1)에서만 접속할 수 있습니다. 다른 기기에 공개하는 주소(예: 0.0.0.0)로 열려면
+token 을 지정해야 하며, 모든 요청에 ?token=... 또는 'Authorization: Bearer ...' 헤더가 있어야 합니다. (없으면 401)
+
+테스트: StatsServer(port=0).start() 로 빈 포트를 받아 localhost 에서 접속합니다.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import ipaddress
+import json
+import threading
+from urllib.parse import parse_qs
+
+from fpa.logs import build_log_record, analyze_pass_row
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# 전송이 밀린 WebSocket 클라이언트는 이 수만큼 메시지가 쌓이면 끊음 (다른 클라이언트에 영향 없도록)
+CLIENT_QUEUE_SIZE = 256
+MAX_HEADER_BYTES = 16 * 1024
+# stop() 시 WebSocket 클라이언트에 close 프레임을 보낼 시간 (초)
+SHUTDOWN_TIMEOUT = 0.5
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+def is_loopback(host):
+    """ 이 PC 에서만 접속할 수 있는 주소인지 여부 """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, default=str).encode('utf-8')
+
+
+def _ws_frame(payload, opcode=0x1):
+    # 서버 → 클라이언트 프레임은 마스킹하지 않음 (RFC 6455)
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, 'big')
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, 'big')
+    return header + payload
+
+
+async def _read_ws_frame(reader):
+    """ 클라이언트 프레임 하나를 읽어 (opcode, payload) 를 반환합니다. """
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), 'big')
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), 'big')
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def compute_match_summaries(records, roster=None, match_date=None):
+    """
+    이벤트 레코드 목록으로 export_log 와 같은 선수별 요약 / 점수를 계산해 {시트 이름: 레코드 목록} 으로 반환합니다.
+    (pandas 를 사용하므로 서버의 작업 스레드에서 호출)
+    """
+    import pandas as pd
+
+    from fpa.analysis import analyze_pass_data
+    from fpa.constants import LOG_COLUMNS
+    from fpa.summary import create_summary_sheets
+    from fpa.xg import add_xg_to_data
+
+    records = [record for record in records if record.get('Action')]
+    if not records:
+        return {}
+    df = pd.DataFrame(records).reindex(columns=LOG_COLUMNS)
+    if roster is not None:
+        df['PlayerID'] = roster.resolve_frame(df, 'Player', date=match_date)
+    else:
+        df = df.drop(columns=['PlayerID', 'ReceiverID'])
+    sheets = create_summary_sheets(add_xg_to_data(analyze_pass_data(df)))
+    # to_json 이 NaN → null, numpy 타입 변환을 처리
+    return {name: json.loads(sheet.reset_index().to_json(orient='records'))
+            for name, sheet in sheets.items() if not sheet.empty and len(sheet.columns)}
+
+
+class StatsServer:
+    """
+    현재 경기 로그를 미러링해 HTTP / WebSocket 으로 제공하는 읽기 전용 서버.
+
+    GUI 스레드에서 호출하는 메서드는 start / stop / publish_* 뿐이며,
+    publish_* 는 변경 내용을 서버 이벤트 루프에 넘기기만 합니다. (call_soon_threadsafe)
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, roster=None, match_date=None, token=None):
+        if token is None and not is_loopback(host):
+            raise ValueError(f"다른 기기에서 접속할 수 있는 주소({host})로 열려면 접속 토큰(token)이 필요합니다.")
+        self.host = host
+        self.port = port
+        self.token = token            # None 이면 인증 없음 (loopback 전용)
+        self.roster = roster          # 읽기 전용으로 사용 (등록은 GUI 스레드에서만, 동시 접근은 명단의 잠금이 처리)
+        self.match_date = match_date
+        self.loop = None
+        self._thread = None
+        self._server = None
+        self._ready = threading.Event()
+        self._error = None
+
+        # 아래 상태는 서버 스레드에서만 변경
+        self.logs = []
+        self.records = []
+        self.id_inputs = ('', '', '')
+        self.version = 0
+        self.clients = set()
+        self._summary_cache = (None, None)   # (version, JSON bytes)
+        self._summary_task = None
+
+    # ---------- GUI 스레드에서 호출 ----------
+
+    def start(self, timeout=5):
+        """ 서버 스레드를 시작하고 접속을 받을 준비가 될 때까지 기다립니다. 실제 (host, port) 를 반환합니다. """
+        self._thread = threading.Thread(target=self._run, name='fpa-stats-server', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError("통계 서버가 시작되지 않았습니다.")
+        if self._error is not None:
+            raise self._error
+        return self.host, self.port
+
+    def stop(self, timeout=5):
+        if self.loop is None or not self.loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout)
+        self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def publish_insert(self, first, logs, id_inputs):
+        """ first 위치에 로그 문자열들이 추가되었음을 알립니다. """
+        self._post(('insert', first, list(logs), tuple(id_inputs)))
+
+    def publish_remove(self, first, last):
+        """ first ~ last 행이 삭제되었음을 알립니다. """
+        self._post(('remove', first, last, None))
+
+    def publish_reset(self, logs, id_inputs):
+        """ 로그 전체가 바뀌었음을 알립니다. (순서 변경, 수정, 불러오기) """
+        self._post(('reset', 0, list(logs), tuple(id_inputs)))
+
+    def _post(self, change):
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._apply_change, change)
+        except RuntimeError:
+            pass  # 서버가 이미 종료됨
+
+    # ---------- 서버 스레드 ----------
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            self.loop.close()
+            return
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_default_executor())
+            self.loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        for queue in list(self.clients):
+            self._close_client(queue)
+        # 남은 연결 작업(전송 중인 WebSocket, 요약 계산을 기다리는 요청)은 잠시 기다린 뒤 취소
+        tasks = [task for task in asyncio.all_tasks(self.loop) if task is not asyncio.current_task()]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self._server.wait_closed()
+        self.loop.call_soon(self.loop.stop)
+
+    def _event_record(self, log, no):
+        match_id, teamid_h, teamid_a = self.id_inputs
+        try:
+            record = build_log_record(log, no, match_id, teamid_h, teamid_a, match_date=self.match_date)
+            record.update(analyze_pass_row(record))
+        except Exception:
+            return {'No': no, 'Raw': log}   # 형식이 맞지 않는 로그도 순서는 유지
+        if self.roster is not None:
+            record['PlayerID'] = self.roster.resolve(record.get('TeamID'), record.get('Player'), self.match_date)
+            if record.get('Receiver'):
+                record['ReceiverID'] = self.roster.resolve(record.get('TeamID'), record['Receiver'], self.match_date)
+        # 좌표 계산 실패 값(NaN)은 JSON 에 쓸 수 없으므로 비움
+        return {key: (None if isinstance(value, float) and value != value else value)
+                for key, value in record.items()}
+
+    def _renumber(self, start):
+        for no, record in enumerate(self.records[start:], start=start + 1):
+            record['No'] = no
+
+    def _apply_change(self, change):
+        kind, first, payload, id_inputs = change
+        if id_inputs is not None and id_inputs != self.id_inputs:
+            # ID 입력이 바뀌면 TeamID 가 달라지므로 전체를 다시 보냄
+            self.id_inputs = id_inputs
+            if kind == 'insert':
+                self.logs[first:first] = payload
+                kind, payload = 'reset', self.logs
+
+        if kind == 'insert':
+            self.logs[first:first] = payload
+            new_records = [self._event_record(log, first + i + 1) for i, log in enumerate(payload)]
+            self.records[first:first] = new_records
+            self._renumber(first + len(payload))
+            message = {'type': 'insert', 'first': first, 'events': new_records}
+        elif kind == 'remove':
+            last = payload
+            del self.logs[first:last + 1]
+            del self.records[first:last + 1]
+            self._renumber(first)
+            message = {'type': 'remove', 'first': first, 'last': last}
+        else:
+            self.logs = list(payload)
+            self.records = [self._event_record(log, no) for no, log in enumerate(self.logs, start=1)]
+            message = {'type': 'reset', 'events': self.records}
+
+        self.version += 1
+        message['version'] = self.version
+        message['score'] = self.score()
+        self._broadcast(_json_bytes(message))
+
+    def score(self):
+        goals = {'home': 0, 'away': 0}
+        for record in self.records:
+            if record.get('Action') == 'Goal' and record.get('Team') in goals:
+                goals[record['Team']] += 1
+        return goals
+
+    def snapshot(self):
+        return {'type': 'snapshot', 'version': self.version, 'events': self.records, 'score': self.score()}
+
+    def _broadcast(self, message):
+        frame = _ws_frame(message)
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # 너무 느린 클라이언트는 끊음 (다시 접속하면 snapshot 부터 받음)
+                self._close_client(queue)
+
+    def _close_client(self, queue):
+        # 전송 루프가 None 을 받으면 close 프레임을 보내고 종료
+        self.clients.discard(queue)
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _summary_bytes(self):
+        version, cached = self._summary_cache
+        if version == self.version:
+            return cached
+        # 요청이 몰려도 버전당 한 번만 계산
+        if self._summary_task is None or self._summary_task[0] != self.version:
+            records = [dict(record) for record in self.records]
+            future = self.loop.run_in_executor(None, compute_match_summaries, records, self.roster,
+                                               self.match_date)
+            self._summary_task = (self.version, future)
+        task_version, future = self._summary_task
+        try:
+            sheets = await future
+        except Exception:
+            # 실패한 계산은 캐시하지 않음 (다음 요청에서 다시 계산)
+            if self._summary_task is not None and self._summary_task[1] is future:
+                self._summary_task = None
+            raise
+        body = _json_bytes({'version': task_version, **sheets})
+        if task_version >= (self._summary_cache[0] or 0):
+            self._summary_cache = (task_version, body)
+        return body
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            method, target, _ = request_line.split(' ', 2)
+            headers = {}
+            for line in header_lines:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+            path, _, query = target.partition('?')
+
+            if not self._authorized(headers, query):
+                await self._respond(writer, 401, b'{"error": "token required"}')
+            elif method != 'GET':
+                await self._respond(writer, 405, b'{"error": "read-only"}')
+            elif path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                await self._serve_websocket(reader, writer, headers)
+            elif path == '/events':
+                await self._respond(writer, 200, _json_bytes({'version': self.version, 'events': self.records}))
+            elif path == '/score':
+                await self._respond(writer, 200, _json_bytes({'version': self.version, **self.score()}))
+            elif path == '/summary':
+                try:
+                    body = await self._summary_bytes()
+                except Exception as e:
+                    await self._respond(writer, 500, _json_bytes({'error': f"요약 계산 실패: {e}"}))
+                else:
+                    await self._respond(writer, 200, body)
+            else:
+                await self._respond(writer, 404, b'{"error": "not found"}')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # stop() 에서 취소됨 (취소된 채로 끝나면 start_server 가 오류 로그를 남김)
+        finally:
+            writer.close()
+
+    def _authorized(self, headers, query):
+        if self.token is None:
+            return True
+        supplied = parse_qs(query).get('token', [''])[0]
+        authorization = headers.get('authorization', '')
+        if authorization.lower().startswith('bearer '):
+            supplied = authorization[7:].strip()
+        return hmac.compare_digest(supplied.encode('utf-8'), self.token.encode('utf-8'))
+
+    async def _respond(self, writer, status, body):
+        reason = {200: 'OK', 401: 'Unauthorized', 404: 'Not Found', 405: 'Method Not Allowed',
+                  500: 'Internal Server Error'}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Access-Control-Allow-Origin: *\r\n"
+                     f"Cache-Control: no-store\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+
+    async def _serve_websocket(self, reader, writer, headers):
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode('latin-1')).digest()).decode('latin-1')
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode('latin-1'))
+
+        queue = asyncio.Queue(CLIENT_QUEUE_SIZE)
+        queue.put_nowait(_ws_frame(_json_bytes(self.snapshot())))
+        self.clients.add(queue)
+        receiver = asyncio.ensure_future(self._read_client(reader, queue))
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    writer.write(_ws_frame(b'', opcode=0x8))
+                    await writer.drain()
+                    break
+                writer.write(frame)
+                await writer.drain()
+        finally:
+            self.clients.discard(queue)
+            receiver.cancel()
+
+    async def _read_client(self, reader, queue):
+        # 읽기 전용이므로 클라이언트 메시지는 무시하고 ping / close 만 처리
+        try:
+            while True:
+                opcode, payload = await _read_ws_frame(reader)
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    queue.put_nowait(_ws_frame(payload, opcode=0xA))
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.QueueFull):
+            pass
+        if queue in self.clients:
+            self._close_client(queue)
@@ -0,0 +1,229 @@
+"""
+선수별 요약 통계와 합산 가능한 부분 집계
+"""
+import pandas as pd
+
+from fpa.constants import SHOT_ACTIONS
+from fpa.scores import (
+    calculate_pass_score, calculate_shooting_score, calculate_cross_score,
+    calculate_tackle_score, calculate_heading_score)
+
+
+# 시즌 집계는 정수 PlayerID 만으로 묶음 (이적 / 등번호 변경이 있어도 같은 선수)
+PARTIAL_KEYS = ['PlayerID']
+# 경기 요약은 PlayerID 옆에 읽기 쉽도록 등번호를 함께 인덱스로 둠
+MATCH_KEYS = ['PlayerID', 'Player']
+PASS_DIRECTIONS = ['forward', 'backward', 'left', 'right']
+PASS_DISTANCES = ['short', 'middle', 'long']
+
+
+def create_match_partials(df_with_xg, keys=PARTIAL_KEYS):
+    """
+    한 경기의 이벤트 데이터로부터 합산 가능한 선수별 부분 집계(횟수, 합계)를 만듭니다.
+
+    모든 컬럼이 횟수 또는 합계이므로 merge_partials 로 여러 경기를 그대로 더할 수 있습니다.
+    성공률 같은 비율과 점수는 derive_*_summary / calculate_*_score 단계에서 마지막에 계산합니다.
+
+    Args:
+        df_with_xg (pd.DataFrame): analyze_pass_data (+ add_xg_to_data) 를 거친 한 경기 데이터프레임.
+        keys (list[str]): 집계 기준 컬럼. 시즌 집계는 PlayerID, 경기 요약은 (PlayerID, Player) 를 사용.
+
+    Returns:
+        pd.DataFrame: keys 를 인덱스로 하는 부분 집계. 'Matches' 는 경기 수(이 경기 = 1)입니다.
+    """
+    df = df_with_xg
+    action = df['Action']
+    tags = df['Tags'].fillna('').astype(str) if 'Tags' in df.columns else pd.Series('', index=df.index)
+    success = tags.str.contains('Success')
+    header = tags.str.contains('Header')
+    pass_direction = df['Pass_Direction'] if 'Pass_Direction' in df.columns else pd.Series(None, index=df.index)
+    pass_distance = df['Pass_Distance'] if 'Pass_Distance' in df.columns else pd.Series(None, index=df.index)
+    xg = df['xG'].fillna(0) if 'xG' in df.columns else pd.Series(0.0, index=df.index)
+
+    is_pass = action.isin(['Pass', 'Cross'])
+    is_shot = action.isin(SHOT_ACTIONS)
+    is_goal = action == 'Goal'
+    on_target = action.isin(['Shot On Target', 'Goal'])
+    is_cross = action == 'Cross'
+    is_tackle = action == 'Tackle'
+    is_aerial = (action == 'Duel') & tags.str.contains('Aerial')
+    is_headed_shot = action.isin(['Shot', 'Shot On Target', 'Goal']) & header
+
+    values = pd.DataFrame({
+        'Total_Pass': is_pass,
+        'Success_Pass': is_pass & success,
+        'Key_Pass': is_pass & tags.str.contains('Key'),
+        'Assist': is_pass & tags.str.contains('Assist'),
+        **{d: is_pass & (pass_direction == d) for d in PASS_DIRECTIONS},
+        **{d: is_pass & (pass_distance == d) for d in PASS_DISTANCES},
+        'Total_Shots': is_shot,
+        'Shots_On_Target': is_shot & on_target,
+        'Goals': is_goal,
+        'Headed_Goals': is_goal & header,
+        'Outbox_Goals': is_goal & tags.str.contains('Out-box'),
+        'Total_Crosses': is_cross,
+        'Successful_Crosses': is_cross & success,
+        'Total_Tackles': is_tackle,
+        'Successful_Tackles': is_tackle & success,
+        'Total_Aerial_Duels': is_aerial,
+        'Aerial_Duels_Won': is_aerial & success,
+        'Total_Headed_Shots': is_headed_shot,
+        'Headed_Shots_On_Target': is_headed_shot & on_target,
+    }, index=df.index).astype(int)
+    values['Total_xG'] = xg.where(is_shot, 0.0)
+
+    # 키에 NaN 이 있으면 groupby 에서 빠지므로 빈 문자열로 통일
+    key_series = [(df[k] if k in df.columns else pd.Series('', index=df.index)).fillna('').rename(k)
+                  for k in keys]
+    partials = values.groupby(key_series).sum()
+    partials['Matches'] = 1
+    return partials
+
+
+def merge_partials(partials):
+    """
+    create_match_partials 결과 여러 개를 하나로 합칩니다.
+
+    덧셈만 하므로 결합 순서와 무관하며, 이미 합쳐진 결과(시즌 누계)에
+    새 경기 부분 집계 하나를 더하는 식으로도 사용할 수 있습니다.
+    """
+    partials = [p for p in partials if p is not None and not p.empty]
+    if not partials:
+        return pd.DataFrame()
+    merged = pd.concat(partials)
+    return merged.groupby(level=list(range(merged.index.nlevels))).sum()
+
+
+def _as_int_columns(summary, columns):
+    for col in columns:
+        if col in summary.columns: summary[col] = summary[col].astype(int)
+    return summary
+
+
+def derive_pass_summary(partials):
+    """ 부분 집계로부터 create_player_summary 와 같은 형식의 패스 요약을 만듭니다. """
+    if partials.empty or partials['Total_Pass'].sum() == 0:
+        return pd.DataFrame(index=partials.index)
+
+    summary = partials[['Total_Pass', 'Success_Pass', 'Key_Pass', 'Assist'] + PASS_DIRECTIONS + PASS_DISTANCES].copy()
+    summary['Fail_Pass'] = summary['Total_Pass'] - summary['Success_Pass']
+    summary['Pass_Success_Rate'] = (summary['Success_Pass'] / summary['Total_Pass'] * 100).fillna(0).round(2)
+    int_cols = ['Total_Pass', 'Success_Pass', 'Fail_Pass', 'Key_Pass', 'Assist'] + PASS_DIRECTIONS + PASS_DISTANCES
+    summary = _as_int_columns(summary, int_cols)
+    final_columns_order = ['Total_Pass', 'Success_Pass', 'Fail_Pass', 'Pass_Success_Rate', 'Key_Pass', 'Assist',
+                           'forward', 'backward', 'left', 'right', 'short', 'middle', 'long']
+    summary = summary[final_columns_order]
+    return summary.sort_values(by='Total_Pass', ascending=False)
+
+
+def derive_shooter_summary(partials):
+    """ 부분 집계로부터 create_shooter_summary 와 같은 형식의 슈팅 요약을 만듭니다. """
+    if partials.empty or partials['Total_Shots'].sum() == 0:
+        return pd.DataFrame(index=partials.index)
+
+    summary = partials[['Total_Shots', 'Shots_On_Target', 'Goals', 'Total_xG',
+                        'Headed_Goals', 'Outbox_Goals']].copy()
+    summary = _as_int_columns(summary, ['Total_Shots', 'Shots_On_Target', 'Goals', 'Headed_Goals', 'Outbox_Goals'])
+    return summary.sort_values(by='Goals', ascending=False)
+
+
+def derive_cross_summary(partials):
+    """ 부분 집계로부터 create_cross_summary 와 같은 형식의 크로스 요약을 만듭니다. """
+    if partials.empty or partials['Total_Crosses'].sum() == 0:
+        return pd.DataFrame(index=partials.index)
+
+    summary = _as_int_columns(partials[['Total_Crosses', 'Successful_Crosses']].copy(),
+                              ['Total_Crosses', 'Successful_Crosses'])
+    summary['Cross_Accuracy'] = (summary['Successful_Crosses'] / summary['Total_Crosses'] * 100).fillna(0).round(2)
+    return summary
+
+
+def derive_tackle_summary(partials):
+    """ 부분 집계로부터 create_tackle_summary 와 같은 형식의 태클 요약을 만듭니다. """
+    if partials.empty or partials['Total_Tackles'].sum() == 0:
+        return pd.DataFrame(index=partials.index)
+
+    summary = _as_int_columns(partials[['Total_Tackles', 'Successful_Tackles']].copy(),
+                              ['Total_Tackles', 'Successful_Tackles'])
+    summary['Tackle_Success_Rate'] = (summary['Successful_Tackles'] / summary['Total_Tackles'] * 100).fillna(0).round(2)
+    return summary
+
+
+def derive_heading_summary(partials):
+    """ 부분 집계로부터 create_heading_summary 와 같은 형식의 헤딩 요약을 만듭니다. """
+    has_aerial = not partials.empty and partials['Total_Aerial_Duels'].sum() > 0
+    has_headed_shots = not partials.empty and partials['Total_Headed_Shots'].sum() > 0
+    summary = pd.DataFrame(index=partials.index)
+
+    if has_aerial:
+        summary['Total_Aerial_Duels'] = partials['Total_Aerial_Duels'].astype(int)
+        summary['Aerial_Duels_Won'] = partials['Aerial_Duels_Won'].astype(int)
+        summary['Aerial_Duel_Success_Rate'] = (
+                summary['Aerial_Duels_Won'] / summary['Total_Aerial_Duels'] * 100).fillna(0).round(2)
+    if has_headed_shots:
+        summary['Total_Headed_Shots'] = partials['Total_Headed_Shots'].astype(int)
+        summary['Headed_Shots_On_Target'] = partials['Headed_Shots_On_Target'].astype(int)
+        summary['Headed_SOT_Rate'] = (summary['Headed_Shots_On_Target'] / summary[
+            'Total_Headed_Shots'] * 100).fillna(0).round(2)
+    return summary
+
+
+def _match_partials_by_player(df):
+    # 경기 요약용: 선수 기준 부분 집계를 원래 선수 등장 순서로 정렬 (이벤트가 없는 선수는 0)
+    # PlayerID 가 없는 (명단 연결 전) 데이터는 등번호만으로 묶음
+    keys = MATCH_KEYS if 'PlayerID' in df.columns else ['Player']
+    order = df[keys].fillna('').drop_duplicates()
+    all_players = pd.MultiIndex.from_frame(order) if len(keys) > 1 else pd.Index(order[keys[0]])
+    return create_match_partials(df, keys=keys).reindex(all_players).fillna(0)
+
+
+# 1. create_player_summary 수정
+def create_player_summary(df_analyzed):
+    return derive_pass_summary(_match_partials_by_player(df_analyzed))
+
+
+# 2. create_shooter_summary 수정
+def create_shooter_summary(df_with_xg):
+    return derive_shooter_summary(_match_partials_by_player(df_with_xg))
+
+
+# 3. create_cross_summary 수정
+def create_cross_summary(df_analyzed):
+    return derive_cross_summary(_match_partials_by_player(df_analyzed))
+
+
+# 4. create_tackle_summary 수정
+def create_tackle_summary(df_analyzed):
+    return derive_tackle_summary(_match_partials_by_player(df_analyzed))
+
+
+# 5. create_heading_summary 수정
+def create_heading_summary(df_analyzed):
+    return derive_heading_summary(_match_partials_by_player(df_analyzed))
+
+
+def score_summaries(pass_summary, shooter_summary, cross_summary, tackle_summary, heading_summary):
+    """
+    다섯 가지 선수별 요약에 점수를 계산해 Excel 시트 이름별 딕셔너리로 반환합니다.
+    경기 저장(export_log), 시즌 집계, 실시간 서버가 모두 이 시트 구성을 사용합니다.
+    """
+    return {
+        'Player_Summary': pass_summary,
+        # calculate_pass_score 는 입력에 점수 컬럼을 추가하므로 복사본으로 계산
+        'Player_Score': calculate_pass_score(pass_summary.copy()),
+        'Shooter_Summary': shooter_summary,
+        'Shooting_Score': calculate_shooting_score(shooter_summary),
+        'Cross_Summary': cross_summary,
+        'Cross_Score': calculate_cross_score(cross_summary),
+        'Tackle_Summary': tackle_summary,
+        'Tackle_Score': calculate_tackle_score(tackle_summary),
+        'Heading_Summary': heading_summary,
+        'Heading_Score': calculate_heading_score(heading_summary),
+    }
+
+
+def create_summary_sheets(df_with_xg):
+    """ 분석 + xG 가 더해진 한 경기 이벤트로 score_summaries 의 시트들을 만듭니다. """
+    return score_summaries(create_player_summary(df_with_xg), create_shooter_summary(df_with_xg),
+                           create_cross_summary(df_with_xg), create_tackle_summary(df_with_xg),
+                           create_heading_summary(df_with_xg))
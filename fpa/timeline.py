@@ -0,0 +1,192 @@
+"""
+분 단위 모멘텀 / 롤링 스탯
+"""
+import math
+
+import pandas as pd
+
+from fpa.constants import SHOT_ACTIONS, FIELD_W
+from fpa.xg import xg_from_position
+
+
+FINAL_THIRD_X = FIELD_W * 2 // 3  # 보정 좌표 기준 파이널 서드 시작 지점 (105m 의 2/3 = 70)
+MOMENTUM_METRICS = ['Passes', 'Final_Third_Entries', 'Shots', 'xG', 'Tackles', 'Successful_Tackles']
+# 롤링 구간 합계에 곱해 모멘텀 지수를 만드는 가중치
+MOMENTUM_WEIGHTS = {'Passes': 0.1, 'Final_Third_Entries': 1.0, 'Shots': 2.0, 'xG': 10.0, 'Successful_Tackles': 0.5}
+
+
+def parse_event_minute(time_str):
+    """
+    이벤트 Time 문자열에서 경기 분(minute)을 구합니다.
+    'MM:SS' (타임라인 카운터) 는 MM 으로 변환합니다.
+    'HH:mm:ss' (타임라인 없이 입력한 현재 시각) 는 경기 분과 섞이면 그래프 범위가 하루 단위로 늘어나므로
+    변환할 수 없는 값과 마찬가지로 None 을 반환합니다. (모멘텀 계산에서 제외)
+    """
+    parts = str(time_str).strip().split(':')
+    if len(parts) == 3:
+        return None
+    try:
+        return int(parts[0])
+    except ValueError:
+        return None
+
+
+def event_momentum_values(record):
+    """
+    analyze_pass_row 결과가 합쳐진 이벤트 레코드 하나의 모멘텀 지표 값을
+    MOMENTUM_METRICS 순서의 리스트로 반환합니다.
+    """
+    action = record.get('Action', '')
+    success = 'Success' in str(record.get('Tags', ''))
+    is_pass = action in ('Pass', 'Cross')
+    start_x, end_x = record.get('StartX_adj', float('nan')), record.get('EndX_adj', float('nan'))
+    entry = is_pass and success and start_x < FINAL_THIRD_X <= end_x
+    is_shot = action in SHOT_ACTIONS
+    xg = float(xg_from_position(start_x, record.get('StartY_adj', float('nan')))) if is_shot else 0.0
+    if math.isnan(xg):
+        xg = 0.0
+    is_tackle = action == 'Tackle'
+    return [int(is_pass), int(entry), int(is_shot), xg, int(is_tackle), int(is_tackle and success)]
+
+
+def create_momentum_timeline(df_with_xg, window=5):
+    """
+    이벤트를 전/후반, 팀, 분 단위로 묶어 분당 지표와 롤링 구간(window 분) 지표를 계산합니다.
+
+    누적합(cumsum)에서 window 분 전 누적합을 빼는 방식으로 롤링 값을 구하므로
+    구간마다 다시 필터링하지 않습니다.
+
+    Args:
+        df_with_xg (pd.DataFrame): analyze_pass_data + add_xg_to_data 를 거친 데이터프레임.
+        window (int): 롤링 구간 길이(분).
+
+    Returns:
+        pd.DataFrame: Half, Team, Minute 별 분당 지표, Rolling_* 지표, Cumulative_xG,
+                      Rolling_Tackle_Success_Rate, Momentum 컬럼을 가진 데이터프레임.
+    """
+    df = df_with_xg.copy()
+    df['Minute'] = df['Time'].map(parse_event_minute)
+    df = df.dropna(subset=['Minute'])
+    if df.empty:
+        return pd.DataFrame()
+    df['Minute'] = df['Minute'].astype(int)
+    df['Team'] = df['Team'].astype(str).str.lower()
+
+    tags = df['Tags'].fillna('').astype(str) if 'Tags' in df.columns else pd.Series('', index=df.index)
+    success = tags.str.contains('Success')
+    is_pass = df['Action'].isin(['Pass', 'Cross'])
+    df['Passes'] = is_pass.astype(int)
+    df['Final_Third_Entries'] = (is_pass & success & (df['StartX_adj'] < FINAL_THIRD_X) &
+                                 (df['EndX_adj'] >= FINAL_THIRD_X)).astype(int)
+    df['Shots'] = df['Action'].isin(SHOT_ACTIONS).astype(int)
+    df['xG'] = df['xG'].fillna(0) if 'xG' in df.columns else 0.0
+    is_tackle = df['Action'] == 'Tackle'
+    df['Tackles'] = is_tackle.astype(int)
+    df['Successful_Tackles'] = (is_tackle & success).astype(int)
+
+    per_minute = df.groupby(['Half', 'Team', 'Minute'])[MOMENTUM_METRICS].sum()
+
+    # 이벤트가 없는 분도 0으로 채워 전/후반별 연속된 분 단위 그리드를 만듦
+    minute_range = df.groupby('Half')['Minute'].agg(['min', 'max'])
+    teams = sorted(df['Team'].unique())
+    grid = [(half, team, minute)
+            for half, (lo, hi) in minute_range.iterrows()
+            for team in teams
+            for minute in range(lo, hi + 1)]
+    per_minute = per_minute.reindex(pd.MultiIndex.from_tuples(grid, names=['Half', 'Team', 'Minute'])).fillna(0)
+
+    group_keys = ['Half', 'Team']
+    cumulative = per_minute.groupby(level=group_keys).cumsum()
+    rolling = cumulative - cumulative.groupby(level=group_keys).shift(window).fillna(0)
+
+    timeline = per_minute.join(rolling.add_prefix('Rolling_'))
+    timeline['Cumulative_xG'] = cumulative['xG']
+    timeline['Rolling_Tackle_Success_Rate'] = (
+            rolling['Successful_Tackles'] / rolling['Tackles'] * 100).fillna(0).round(2)
+    timeline['Momentum'] = sum(rolling[col] * weight for col, weight in MOMENTUM_WEIGHTS.items()).round(2)
+
+    int_cols = ['Passes', 'Final_Third_Entries', 'Shots', 'Tackles', 'Successful_Tackles']
+    for col in int_cols:
+        timeline[col] = timeline[col].astype(int)
+        timeline['Rolling_' + col] = timeline['Rolling_' + col].astype(int)
+    return timeline.reset_index()
+
+
+class MomentumTracker:
+    """
+    create_momentum_timeline 의 증분(incremental) 버전입니다.
+
+    (Half, Team) 별로 분 단위 지표 증가분(delta) 배열만 갱신하므로 이벤트가 어느 분에 들어오든
+    추가 비용은 O(1) 입니다. 누적합은 조회할 때 가장 앞에서 바뀐 분부터만 다시 더하므로,
+    삭제/수정 후 전체를 다시 쌓아도 누적합 계산은 조회 시 한 번뿐입니다.
+    롤링 값은 누적합 두 개의 차로 바로 구합니다.
+    """
+
+    def __init__(self, window=5):
+        self.window = window
+        self.deltas = {}        # (half, team) -> [[분당 지표 합...] for minute]
+        self.cumulative = {}    # (half, team) -> [[지표 누적합...] for minute] (dirty_from 이전까지만 유효)
+        self.dirty_from = {}    # (half, team) -> 누적합을 다시 계산해야 하는 첫 분
+        self.first_minute = {}  # half -> 처음 기록된 분
+
+    def clear(self):
+        self.deltas.clear()
+        self.cumulative.clear()
+        self.dirty_from.clear()
+        self.first_minute.clear()
+
+    def add_event(self, record):
+        """ analyze_pass_row 결과가 합쳐진 레코드 하나를 반영합니다. """
+        minute = parse_event_minute(record.get('Time', ''))
+        if minute is None:
+            return
+        half = record.get('Half', '')
+        team = str(record.get('Team', '')).lower()
+        key = (half, team)
+
+        if half not in self.first_minute or minute < self.first_minute[half]:
+            self.first_minute[half] = minute
+        deltas = self.deltas.setdefault(key, [])
+        while len(deltas) <= minute:
+            deltas.append([0] * len(MOMENTUM_METRICS))
+        row = deltas[minute]
+        for i, value in enumerate(event_momentum_values(record)):
+            row[i] += value
+        self.dirty_from[key] = min(self.dirty_from.get(key, minute), minute)
+
+    def _cumulative(self, key):
+        cumulative = self.cumulative.setdefault(key, [])
+        deltas = self.deltas[key]
+        start = min(self.dirty_from.pop(key, len(deltas)), len(cumulative))
+        del cumulative[start:]
+        running = cumulative[-1] if cumulative else [0] * len(MOMENTUM_METRICS)
+        for row in deltas[start:]:
+            running = [total + value for total, value in zip(running, row)]
+            cumulative.append(running)
+        return cumulative
+
+    def _cumulative_at(self, key, minute):
+        if minute < 0 or key not in self.deltas:
+            return [0] * len(MOMENTUM_METRICS)
+        cumulative = self._cumulative(key)
+        return cumulative[min(minute, len(cumulative) - 1)]
+
+    def rolling(self, half, team, minute):
+        """ minute 까지 window 분 동안의 지표 합계를 딕셔너리로 반환합니다. """
+        key = (half, team)
+        now = self._cumulative_at(key, minute)
+        before = self._cumulative_at(key, minute - self.window)
+        return {col: now[i] - before[i] for i, col in enumerate(MOMENTUM_METRICS)}
+
+    def momentum(self, half, team, minute):
+        rolling = self.rolling(half, team, minute)
+        return sum(rolling[col] * weight for col, weight in MOMENTUM_WEIGHTS.items())
+
+    def minute_range(self, half):
+        if half not in self.first_minute:
+            return range(0)
+        last = max(len(d) for (h, _), d in self.deltas.items() if h == half) - 1
+        return range(self.first_minute[half], last + 1)
+
+    def halves(self):
+        return sorted(self.first_minute)
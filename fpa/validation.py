@@ -0,0 +1,202 @@
+"""
+불러온 이벤트 파일의 일괄 검증과 자동 복구
+
+파일 전체를 컬럼 단위(벡터 연산)로 한 번씩 검사해 행별 오류 보고서를 만듭니다.
+첫 번째 잘못된 행에서 중단하지 않으므로, 큰 병합 파일도 한 번에 모든 문제를 확인할 수 있습니다.
+"""
+import numpy as np
+import pandas as pd
+
+from fpa.constants import ACTION_CODES, FIELD_W, FIELD_H
+
+REQUIRED_COLUMNS = ['Half', 'Team', 'Direction', 'Time', 'Player', 'Action', 'StartX', 'StartY']
+COORD_BOUNDS = {'StartX': FIELD_W, 'StartY': FIELD_H, 'EndX': FIELD_W, 'EndY': FIELD_H}
+# 입력 코드로는 만들 수 없지만 앱이 기록하는 액션 (시작 시 예시 로그의 'Assist')
+APP_ACTIONS = ['Assist']
+KNOWN_ACTIONS = set(ACTION_CODES.values()) | set(APP_ACTIONS)
+# 받는 선수가 있는 액션 (예시 로그의 '10 Assist to 7' 처럼 Assist 도 받는 선수를 기록)
+TWO_PLAYER_ACTIONS = ['Pass', 'Cross', 'Assist']
+# 'MM:SS' (타임라인) 또는 'HH:mm:ss' (현재 시각)
+TIME_PATTERN = r'^\d{1,3}:\d{2}(:\d{2})?$'
+REPORT_COLUMNS = ['Row', 'No', 'Column', 'Issue', 'Message', 'Repairable', 'Severity']
+
+# 오류 코드 → (설명, 자동 복구 가능 여부)
+ISSUES = {
+    'missing_column': ("필수 컬럼이 없습니다.", False),
+    'invalid_coordinate': ("좌표가 숫자가 아닙니다. (복구 시 빈 값)", True),
+    'out_of_bounds': (f"좌표가 필드({FIELD_W} x {FIELD_H}) 범위를 벗어났습니다. (복구 시 경계값으로 보정)", True),
+    'unknown_action': ("알 수 없는 액션입니다.", False),
+    'unexpected_receiver': ("Pass / Cross / Assist 가 아닌 액션에 받는 선수가 있습니다. (복구 시 삭제)", True),
+    'invalid_receiver': ("받는 선수 번호가 올바르지 않습니다. (복구 시 삭제)", True),
+    'missing_player': ("선수 번호가 없습니다.", False),
+    'invalid_player': ("선수 번호가 올바르지 않습니다.", False),
+    'invalid_time': ("시간 형식이 올바르지 않습니다. (MM:SS 또는 HH:mm:ss)", False),
+    'duplicate_no': ("No 값이 중복됩니다. (복구 시 1부터 다시 번호 부여)", True),
+    'missing_id': ("MatchID / TeamID 가 없습니다. (불러온 뒤 저장할 때 입력창의 ID 를 사용)", False),
+}
+# 데이터는 그대로 불러올 수 있는 문제 (보고서에는 남기지만 복구 창을 띄우거나 행을 제외하지 않음)
+WARNING_ISSUES = {'missing_id'}
+
+
+def normalize_jersey(series):
+    """
+    선수 번호 컬럼을 문자열로 통일합니다. (10.0 / '10' / 10 → '10')
+    빈 값이나 정수가 아닌 값은 '' 로 바꿉니다.
+    """
+    numbers = pd.to_numeric(series, errors='coerce')
+    numbers = numbers.where(numbers == numbers.round())
+    return numbers.astype('Int64').astype(str).where(numbers.notna(), '')
+
+
+def _check_unique(series, check, na_result):
+    """
+    문자열 검사를 고유값에만 적용한 뒤 전체 행으로 펼칩니다.
+    Time / TeamID 처럼 반복 값이 많은 컬럼은 행 수가 아니라 고유값 수만큼만 문자열 연산을 합니다.
+    """
+    codes, uniques = pd.factorize(series)
+    results = check(pd.Series(uniques, dtype=object).astype(str).str.strip()).to_numpy(dtype=bool)
+    # factorize 는 NaN 을 -1 로 표시하므로 마지막 칸에 NaN 결과를 붙여 둠
+    results = np.append(results, na_result)
+    return pd.Series(results[codes], index=series.index)
+
+
+def _blank(series):
+    # NaN 이거나 공백 문자열이면 True
+    if pd.api.types.is_numeric_dtype(series):
+        return series.isna()
+    return _check_unique(series, lambda values: values == '', True)
+
+
+def _blank_non_numeric(series, numbers):
+    # 숫자로 변환된 값은 빈 값이 아니므로, 변환에 실패한 행에만 문자열 검사를 적용
+    blank = pd.Series(False, index=series.index)
+    not_numeric = numbers.isna()
+    if not_numeric.any():
+        blank[not_numeric] = _blank(series[not_numeric])
+    return blank
+
+
+def validate_events(df):
+    """
+    이벤트 데이터프레임 전체를 검사해 행별 오류 보고서를 반환합니다.
+
+    검사 항목: 필수 컬럼, 좌표 숫자 여부와 필드 범위, ACTION_CODES 에 있는 액션,
+    Pass / Cross / Assist 에만 있는 받는 선수, 시간 형식, 선수 번호, No 중복, MatchID / TeamID 누락.
+
+    Args:
+        df (pd.DataFrame): 불러온 이벤트 데이터프레임.
+
+    Returns:
+        pd.DataFrame: Row (파일 행 번호, 헤더 = 1), No, Column, Issue, Message, Repairable, Severity 컬럼의 보고서.
+                      Severity 는 'error' 또는 'warning' (WARNING_ISSUES) 입니다.
+                      문제가 없으면 빈 데이터프레임입니다. 파일 단위 오류는 Row 가 비어 있습니다.
+    """
+    found = []
+    row_numbers = pd.Series(range(2, len(df) + 2), index=df.index)
+    numbers = df['No'] if 'No' in df.columns else pd.Series(pd.NA, index=df.index)
+
+    def add(mask, column, issue):
+        if mask.any():
+            found.append(pd.DataFrame({
+                'Row': row_numbers[mask], 'No': numbers[mask], 'Column': column, 'Issue': issue,
+            }))
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        found.append(pd.DataFrame({'Row': pd.NA, 'No': pd.NA, 'Column': missing, 'Issue': 'missing_column'}))
+
+    for col, upper in COORD_BOUNDS.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        add(values.isna() & ~_blank_non_numeric(df[col], values), col, 'invalid_coordinate')
+        add((values < 0) | (values > upper), col, 'out_of_bounds')
+
+    if 'Action' in df.columns:
+        add(~_check_unique(df['Action'], lambda values: values.isin(KNOWN_ACTIONS), False),
+            'Action', 'unknown_action')
+        if 'Receiver' in df.columns:
+            receiver = normalize_jersey(df['Receiver'])
+            has_receiver = ~_blank_non_numeric(df['Receiver'], pd.to_numeric(df['Receiver'], errors='coerce'))
+            two_player = _check_unique(df['Action'], lambda values: values.isin(TWO_PLAYER_ACTIONS), False)
+            add(has_receiver & ~two_player, 'Receiver', 'unexpected_receiver')
+            add(has_receiver & (receiver == ''), 'Receiver', 'invalid_receiver')
+
+    if 'Player' in df.columns:
+        blank_player = _blank_non_numeric(df['Player'], pd.to_numeric(df['Player'], errors='coerce'))
+        add(blank_player, 'Player', 'missing_player')
+        add(~blank_player & (normalize_jersey(df['Player']) == ''), 'Player', 'invalid_player')
+
+    if 'Time' in df.columns:
+        add(~_check_unique(df['Time'], lambda values: values.str.match(TIME_PATTERN), False),
+            'Time', 'invalid_time')
+
+    if 'No' in df.columns:
+        add(df['No'].duplicated(keep='first') & df['No'].notna(), 'No', 'duplicate_no')
+
+    for col in ('MatchID', 'TeamID'):
+        if col in df.columns:
+            add(_blank(df[col]), col, 'missing_id')
+
+    if not found:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    report = pd.concat(found, ignore_index=True)
+    report['Message'] = report['Issue'].map(lambda issue: ISSUES[issue][0])
+    report['Repairable'] = report['Issue'].map(lambda issue: ISSUES[issue][1])
+    report['Severity'] = np.where(report['Issue'].isin(WARNING_ISSUES), 'warning', 'error')
+    return report.sort_values('Row', kind='stable', na_position='first').reset_index(drop=True)[REPORT_COLUMNS]
+
+
+def repair_events(df, report=None, drop_unrepairable=True):
+    """
+    validate_events 보고서의 복구 가능한 문제를 자동으로 고칩니다.
+
+    좌표는 숫자로 변환해 필드 범위로 보정하고, 잘못된 받는 선수는 지우고,
+    선수 번호를 문자열로 통일하고, No 가 중복되면 1부터 다시 매깁니다.
+
+    Args:
+        df (pd.DataFrame): 불러온 이벤트 데이터프레임.
+        report (pd.DataFrame | None): validate_events 결과. 없으면 새로 검사합니다.
+        drop_unrepairable (bool): 복구할 수 없는 문제(알 수 없는 액션 등)가 있는 행을 제외할지 여부.
+
+    Returns:
+        pd.DataFrame: 복구된 데이터프레임 (원본은 변경하지 않음).
+    """
+    if report is None:
+        report = validate_events(df)
+    df = df.copy()
+
+    for col, upper in COORD_BOUNDS.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').clip(0, upper)
+
+    if 'Player' in df.columns:
+        df['Player'] = normalize_jersey(df['Player'])
+    if 'Receiver' in df.columns:
+        receiver = normalize_jersey(df['Receiver'])
+        if 'Action' in df.columns:
+            receiver = receiver.where(
+                _check_unique(df['Action'], lambda values: values.isin(TWO_PLAYER_ACTIONS), False), '')
+        df['Receiver'] = receiver
+
+    if drop_unrepairable and not report.empty:
+        unrepairable = ~report['Repairable'].astype(bool) & (report['Severity'] == 'error')
+        bad_rows = report.loc[unrepairable, 'Row'].dropna().astype(int) - 2
+        df = df.drop(index=df.index[bad_rows.unique()])
+
+    if 'No' in df.columns and (report['Issue'] == 'duplicate_no').any():
+        df['No'] = range(1, len(df) + 1)
+    return df
+
+
+def has_errors(report):
+    """ 경고가 아닌 문제가 있는지 여부 (있을 때만 복구 창을 띄움) """
+    return bool((report['Severity'] == 'error').any()) if not report.empty else False
+
+
+def summarize_report(report):
+    """ 보고서를 오류 코드별 건수 문자열로 요약합니다. (메시지 창 표시용) """
+    if report.empty:
+        return "문제가 없습니다."
+    counts = report.groupby('Issue', sort=False).size()
+    return "\n".join(f"- {ISSUES[issue][0]} ({count}건)" for issue, count in counts.items())
@@ -0,0 +1,46 @@
+"""
+기대 득점(xG) 계산
+"""
+import pandas as pd
+import numpy as np
+
+from fpa.constants import FIELD_W, FIELD_H
+
+
+def xg_from_position(x_adj, y_adj):
+    """
+    보정 좌표(_adj) 기준 슈팅 위치로부터 xG 값을 계산합니다. (스칼라, Series 모두 가능)
+    """
+    # 골대의 위치는 필드 오른쪽 끝 중앙 (105, 34) 으로 고정
+    goal_x, goal_y = FIELD_W, FIELD_H / 2
+    distance = np.sqrt((goal_x - x_adj) ** 2 + (goal_y - y_adj) ** 2)
+
+    # 거리를 기반으로 xG 값을 계산하는 간단한 모델
+    # (거리가 멀수록 xG는 급격히 감소)
+    return 1 / (1 + np.exp(0.14 * distance - 2.5))
+
+
+def add_xg_to_data(df):
+    """
+    전체 데이터프레임에서 슛 이벤트에 대한 기대 득점(xG) 값을 계산하여 추가합니다.
+    """
+    # 슛과 관련된 Action만 필터링
+    shot_actions = ['Goal', 'Shot On Target', 'Shot', 'Blocked Shot']
+    # df.loc를 사용하여 SettingWithCopyWarning 방지
+    df_shots = df[df['Action'].isin(shot_actions)].copy()
+
+    if df_shots.empty:
+        df['xG'] = np.nan  # 슛 데이터가 없으면 xG 컬럼만 추가
+        return df
+
+    # 보정된 좌표(_adj)를 사용하여 골문과의 거리 기반 xG 계산
+    xg_values = xg_from_position(df_shots['StartX_adj'], df_shots['StartY_adj'])
+
+    # 원본 df_shots에 xG 값을 할당
+    df_shots['xG'] = xg_values
+
+    # 원본 데이터프레임(df)에 xG 값을 합치기 (슛이 아닌 이벤트는 NaN)
+    # df.merge를 사용하여 안전하게 병합
+    df = pd.merge(df, df_shots[['No', 'xG']], on='No', how='left')
+
+    return df
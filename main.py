@@ -3,12 +3,27 @@ import re
 import pandas as pd
 import ctypes
 import os
+import secrets
 from PyQt5 import uic, QtGui, QtCore, QtWidgets
 from PyQt5.QtWidgets import (
     QApplication, QDialog, QFileDialog, QMessageBox,
     QGraphicsScene, QGraphicsPixmapItem, QLineEdit, QButtonGroup)
-from PyQt5.QtCore import QTime, QRectF
-import numpy as np
+from PyQt5.QtCore import QTime, QDate, QRectF, QStandardPaths
+
+# 분석 로직은 Qt 의존성 없는 fpa 패키지에 있음
+from fpa.constants import LOG_COLUMNS, ACTION_CODES, TAG_CODES
+from fpa.logs import parse_log_line, build_log_record, analyze_pass_row, StreamingCsvExporter
+from fpa.analysis import analyze_pass_data
+from fpa.xg import add_xg_to_data
+from fpa.summary import create_summary_sheets
+from fpa.timeline import create_momentum_timeline, MomentumTracker
+from fpa.roster import RosterRegistry, default_roster_path
+from fpa.server import StatsServer, DEFAULT_PORT, is_loopback
+from fpa.pitch import PitchTransform
+from fpa.merge import merge_event_files
+from fpa.season import read_event_file
+from fpa.validation import (
+    validate_events, repair_events, summarize_report, normalize_jersey, has_errors, TWO_PLAYER_ACTIONS)
 
 # DPI 인식 + 고해상도 아이콘 사용
 if hasattr(QtCore.Qt, 'AA_EnableHighDpiScaling'):
@@ -16,6 +31,13 @@ if hasattr(QtCore.Qt, 'AA_EnableHighDpiScaling'):
 if hasattr(QtCore.Qt, 'AA_UseHighDpiPixmaps'):
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
 
+# 실시간 통계 서버 주소 (기본은 이 PC 에서만 접속, 환경 변수로 변경 가능)
+# 벤치 태블릿 등 같은 네트워크의 기기에 공개하려면 FPA_STATS_HOST=0.0.0.0 처럼 명시해야 하며,
+# 이때는 접속 토큰(FPA_STATS_TOKEN, 없으면 서버를 켤 때마다 새로 생성)이 있어야 접속할 수 있음
+STATS_SERVER_HOST = os.environ.get("FPA_STATS_HOST", "127.0.0.1")
+STATS_SERVER_PORT = int(os.environ.get("FPA_STATS_PORT", DEFAULT_PORT))
+STATS_SERVER_TOKEN = os.environ.get("FPA_STATS_TOKEN") or None
+
 def resource_path(relative_path):
     """ PyInstaller 실행 또는 개발 환경에서 리소스 경로 찾기 """
     if hasattr(sys, '_MEIPASS'):
@@ -23,411 +45,152 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
-def analyze_pass_data(df):
-    """
-    경기 이벤트 데이터프레임을 분석하여 보정 좌표, 패스 거리, 패스 방향을 추가합니다.
-
-    Args:
-        df (pd.DataFrame): 'StartX', 'StartY', 'EndX', 'EndY', 'Direction' 등의
-                           컬럼을 포함하는 데이터프레임.
-
-    Returns:
-        pd.DataFrame: 분석 결과(보정 좌표, 거리, 방향 등)가 추가된 데이터프레임.
-    """
-    # --- 0. 사전 준비 ---
-    # 필드 규격 설정
-    FIELD_W = 105  # 필드 가로 길이
-    FIELD_H = 68  # 필드 세로 너비
-
-    # 좌표 데이터가 숫자가 아닐 경우를 대비해 숫자형으로 변환
-    coord_cols = ['StartX', 'StartY', 'EndX', 'EndY']
-    for col in coord_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # 분석에 필요한 컬럼이 없는 경우 원본 데이터프레임 반환
-    if not all(col in df.columns for col in coord_cols + ['Direction']):
-        print("분석에 필요한 컬럼이 부족합니다.")
-        return df
-
-    # --- 1. 보정 좌표 산출 ---
-    # Direction이 'left'일 경우, 모든 좌표를 180도 회전시켜 'right' 기준으로 통일
-    is_left_direction = df['Direction'].str.lower() == 'left'
-
-    df['StartX_adj'] = np.where(is_left_direction, FIELD_W - df['StartX'], df['StartX'])
-    df['StartY_adj'] = np.where(is_left_direction, FIELD_H - df['StartY'], df['StartY'])
-    df['EndX_adj'] = np.where(is_left_direction, FIELD_W - df['EndX'], df['EndX'])
-    df['EndY_adj'] = np.where(is_left_direction, FIELD_H - df['EndY'], df['EndY'])
-
-    # --- 2. 패스 거리 분류 ---
-    # 보정된 좌표를 기준으로 두 점 사이의 거리(유클리드 거리) 계산
-    distance = np.sqrt(
-        (df['EndX_adj'] - df['StartX_adj']) ** 2 + (df['EndY_adj'] - df['StartY_adj']) ** 2
-    )
-    df['Distance'] = distance
-
-    # 거리(distance) 값에 따라 구간 나누기
-    conditions_dist = [
-        distance < 20,
-        (distance >= 20) & (distance < 40),
-        distance >= 40
-    ]
-    choices_dist = ['short', 'middle', 'long']
-    df['Pass_Distance'] = np.select(conditions_dist, choices_dist, default=None)
-
-    # --- 3. 패스 방향 분류 ---
-    # 보정된 좌표를 기준으로 각도 계산 (atan2 사용)
-    dx = df['EndX_adj'] - df['StartX_adj']
-    dy = df['EndY_adj'] - df['StartY_adj']
-    angle = np.degrees(np.arctan2(dy, dx))
-
-    # 각도를 0~360 범위로 변환
-    df['Angle'] = (angle + 360) % 360
-
-    # 각도(angle) 값에 따라 방향 분류
-    conditions_dir = [
-        (df['Angle'] >= 315) | (df['Angle'] < 45),  # 전진 (forward)
-        (df['Angle'] >= 45) & (df['Angle'] < 135),  # 좌측 (left)
-        (df['Angle'] >= 135) & (df['Angle'] < 225),  # 후진 (backward)
-        (df['Angle'] >= 225) & (df['Angle'] < 315)  # 우측 (right)
-    ]
-    choices_dir = ['forward', 'left', 'backward', 'right']
-    df['Pass_Direction'] = np.select(conditions_dir, choices_dir, default=None)
-
-    return df
-
-
-# 1. create_player_summary 수정
-def create_player_summary(df_analyzed):
-    all_players = df_analyzed['Player'].unique()  # 전체 선수 명단 확보
-    pass_actions = ['Pass', 'Cross']
-    if 'Tags' not in df_analyzed.columns: df_analyzed['Tags'] = ''
-    df_pass = df_analyzed[df_analyzed['Action'].isin(pass_actions)].copy()
-    if df_pass.empty: return pd.DataFrame(index=all_players).fillna(0)
-
-    summary = df_pass.groupby('Player').agg(
-        Total_Pass=('Action', 'count'),
-        Success_Pass=('Tags', lambda x: x.str.contains('Success').sum()),
-        Key_Pass=('Tags', lambda x: x.str.contains('Key').sum()),
-        Assist=('Tags', lambda x: x.str.contains('Assist').sum())
-    )
-    # ▼▼▼ (추가) 전체 선수 명단을 기준으로 결과표를 재구성하고 없는 선수는 0으로 채움 ▼▼▼
-    summary = summary.reindex(all_players).fillna(0)
-
-    summary['Fail_Pass'] = summary['Total_Pass'] - summary['Success_Pass']
-    summary['Pass_Success_Rate'] = (summary['Success_Pass'] / summary['Total_Pass'] * 100).fillna(0).round(2)
-    # ... (이하 기존과 동일) ...
-    pivot_direction = pd.pivot_table(df_pass, values='Action', index='Player', columns='Pass_Direction',
-                                     aggfunc='count').reindex(all_players).fillna(0)
-    pivot_distance = pd.pivot_table(df_pass, values='Action', index='Player', columns='Pass_Distance',
-                                    aggfunc='count').reindex(all_players).fillna(0)
-    summary = summary.join(pivot_direction, how='left').join(pivot_distance, how='left').fillna(0)
-    ALL_DIRECTIONS = ['forward', 'left', 'right', 'backward'];
-    ALL_DISTANCES = ['short', 'middle', 'long']
-    for col in ALL_DIRECTIONS:
-        if col not in summary.columns: summary[col] = 0
-    for col in ALL_DISTANCES:
-        if col not in summary.columns: summary[col] = 0
-    int_cols = ['Total_Pass', 'Success_Pass', 'Fail_Pass', 'Key_Pass', 'Assist'] + ALL_DIRECTIONS + ALL_DISTANCES
-    for col in int_cols:
-        if col in summary.columns: summary[col] = summary[col].astype(int)
-    final_columns_order = ['Total_Pass', 'Success_Pass', 'Fail_Pass', 'Pass_Success_Rate', 'Key_Pass', 'Assist',
-                           'forward', 'backward', 'left', 'right', 'short', 'middle', 'long']
-    ordered_cols = [col for col in final_columns_order if col in summary.columns]
-    summary = summary[ordered_cols]
-    return summary.sort_values(by='Total_Pass', ascending=False)
-
-
-# 2. create_shooter_summary 수정
-def create_shooter_summary(df_with_xg):
-    all_players = df_with_xg['Player'].unique()
-    shot_actions = ['Goal', 'Shot On Target', 'Shot', 'Blocked Shot']
-    df_shots = df_with_xg[df_with_xg['Action'].isin(shot_actions)].copy()
-    if df_shots.empty: return pd.DataFrame(index=all_players).fillna(0)
-    if 'Tags' not in df_shots.columns: df_shots['Tags'] = ''
-    df_shots['Tags'] = df_shots['Tags'].fillna('')
-
-    summary = df_shots.groupby('Player').agg(
-        Total_Shots=('Action', 'count'),
-        Shots_On_Target=('Action', lambda x: x.isin(['Shot On Target', 'Goal']).sum()),
-        Goals=('Action', lambda x: (x == 'Goal').sum()),
-        Total_xG=('xG', 'sum')
-    ).reindex(all_players).fillna(0)  # reindex 및 fillna(0) 추가
-
-    headed_goals = \
-    df_shots[(df_shots['Action'] == 'Goal') & (df_shots['Tags'].str.contains('Header'))].groupby('Player')[
-        'Action'].count()
-    outbox_goals = \
-    df_shots[(df_shots['Action'] == 'Goal') & (df_shots['Tags'].str.contains('Out-box'))].groupby('Player')[
-        'Action'].count()
-    summary = summary.join(headed_goals.rename('Headed_Goals'))
-    summary = summary.join(outbox_goals.rename('Outbox_Goals'))
-    summary[['Headed_Goals', 'Outbox_Goals']] = summary[['Headed_Goals', 'Outbox_Goals']].fillna(0).astype(int)
-    return summary.sort_values(by='Goals', ascending=False)
-
-
-# 3. create_cross_summary 수정
-def create_cross_summary(df_analyzed):
-    all_players = df_analyzed['Player'].unique()
-    if 'Tags' not in df_analyzed.columns: df_analyzed['Tags'] = ''
-    df_cross = df_analyzed[df_analyzed['Action'] == 'Cross'].copy()
-    if df_cross.empty: return pd.DataFrame(index=all_players).fillna(0)
-
-    summary = df_cross.groupby('Player').agg(
-        Total_Crosses=('Action', 'count'),
-        Successful_Crosses=('Tags', lambda x: x.str.contains('Success').sum())
-    ).reindex(all_players).fillna(0)  # reindex 및 fillna(0) 추가
-    summary['Cross_Accuracy'] = (summary['Successful_Crosses'] / summary['Total_Crosses'] * 100).fillna(0).round(2)
-    return summary
-
-
-# 4. create_tackle_summary 수정
-def create_tackle_summary(df_analyzed):
-    all_players = df_analyzed['Player'].unique()
-    if 'Tags' not in df_analyzed.columns: df_analyzed['Tags'] = ''
-    df_tackle = df_analyzed[df_analyzed['Action'] == 'Tackle'].copy()
-    if df_tackle.empty: return pd.DataFrame(index=all_players).fillna(0)
-
-    summary = df_tackle.groupby('Player').agg(
-        Total_Tackles=('Action', 'count'),
-        Successful_Tackles=('Tags', lambda x: x.str.contains('Success').sum())
-    ).reindex(all_players).fillna(0)  # reindex 및 fillna(0) 추가
-    summary['Tackle_Success_Rate'] = (summary['Successful_Tackles'] / summary['Total_Tackles'] * 100).fillna(0).round(2)
-    return summary
-
-
-# 5. create_heading_summary 수정
-def create_heading_summary(df_analyzed):
-    all_players = df_analyzed['Player'].unique()
-    if 'Tags' not in df_analyzed.columns: df_analyzed['Tags'] = ''
-
-    df_aerial = df_analyzed[(df_analyzed['Action'] == 'Duel') & (df_analyzed['Tags'].str.contains('Aerial'))].copy()
-    if not df_aerial.empty:
-        aerial_summary = df_aerial.groupby('Player').agg(
-            Total_Aerial_Duels=('Action', 'count'),
-            Aerial_Duels_Won=('Tags', lambda x: x.str.contains('Success').sum())
-        )
-        aerial_summary['Aerial_Duel_Success_Rate'] = (
-                    aerial_summary['Aerial_Duels_Won'] / aerial_summary['Total_Aerial_Duels'] * 100).round(2)
-    else:
-        aerial_summary = pd.DataFrame()
-
-    shot_actions = ['Shot', 'Shot On Target', 'Goal']
-    df_headed_shots = df_analyzed[
-        (df_analyzed['Action'].isin(shot_actions)) & (df_analyzed['Tags'].str.contains('Header'))].copy()
-    if not df_headed_shots.empty:
-        headed_shot_summary = df_headed_shots.groupby('Player').agg(
-            Total_Headed_Shots=('Action', 'count'),
-            Headed_Shots_On_Target=('Action', lambda x: x.isin(['Shot On Target', 'Goal']).sum())
-        )
-        headed_shot_summary['Headed_SOT_Rate'] = (headed_shot_summary['Headed_Shots_On_Target'] / headed_shot_summary[
-            'Total_Headed_Shots'] * 100).round(2)
-    else:
-        headed_shot_summary = pd.DataFrame()
-
-    if aerial_summary.empty and headed_shot_summary.empty:
-        summary = pd.DataFrame(index=all_players)
-    elif aerial_summary.empty:
-        summary = headed_shot_summary
-    elif headed_shot_summary.empty:
-        summary = aerial_summary
-    else:
-        summary = pd.merge(aerial_summary, headed_shot_summary, on='Player', how='outer')
-
-    return summary.reindex(all_players).fillna(0)  # reindex 및 fillna(0) 추가
-
-
-# 6. calculate_heading_score 수정 (0으로 나누기 방지)
-def calculate_heading_score(df_heading_summary):
-    summary = df_heading_summary.copy()
-    if summary.empty: return summary
-    required_cols = ['Aerial_Duel_Success_Rate', 'Headed_SOT_Rate', 'Aerial_Duels_Won']
-    for col in required_cols:
-        if col not in summary.columns: summary[col] = 0
-    aerial_score = summary['Aerial_Duel_Success_Rate'] * 0.5
-    shot_score = summary['Headed_SOT_Rate'] * 0.3
-    volume_bonus = np.log1p(summary['Aerial_Duels_Won']) * 2
-    summary['Raw_Heading_Score'] = aerial_score + shot_score + volume_bonus
-    mid_point = 45;
-    steepness = 0.1
-    raw_scores = summary['Raw_Heading_Score']
-    heading_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
-    summary['Heading_Score'] = heading_scores.round(0).astype(int)
-    return summary
-
-def calculate_pass_score(df_summary):
-    """
-    선수별 요약 통계로부터 패스 점수를 계산합니다. (절대평가 버전)
-    """
-    if df_summary.empty:
-        return df_summary
-
-    # 1. 항목별 점수 계산
-    df_summary['Accuracy_Score'] = df_summary['Pass_Success_Rate'] * 0.5
-    df_summary['Influence_Score'] = (df_summary['forward'] / df_summary['Total_Pass']).fillna(0) * 30
-    df_summary['Creativity_Score'] = (df_summary['Key_Pass'] * 2) + (df_summary['Assist'] * 5)
-    df_summary['Volume_Bonus'] = np.log1p(df_summary['Success_Pass']) * 3
-
-    # 2. Raw 점수 합산
-    df_summary['Raw_Score'] = (df_summary['Accuracy_Score'] +
-                               df_summary['Influence_Score'] +
-                               df_summary['Creativity_Score'] +
-                               df_summary['Volume_Bonus'])
-
-    # ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
-    # 3. (수정) Sigmoid 함수를 이용해 1~100점 절대 점수로 변환
-
-    # --- 여기서 기준점을 설정할 수 있습니다 ---
-    mid_point = 50  # Raw_Score가 50점일 때 Pass_Score 50점이 되는 기준점
-    steepness = 0.1  # 곡선의 기울기 (숫자가 클수록 가파름)
-
-    # 시그모이드 함수 계산
-    raw_scores = df_summary['Raw_Score']
-    pass_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
-
-    df_summary['Pass_Score'] = pass_scores.round(0).astype(int)
-    # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
+def user_data_dir():
+    """ 사용자별 앱 데이터 폴더 (패키징된 앱은 작업 폴더에 쓸 수 없을 수 있으므로 명단 등은 여기에 저장) """
+    return QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.path.expanduser("~")
 
-    return df_summary
 
-
-def add_xg_to_data(df):
+class MomentumChartDialog(QDialog):
     """
-    전체 데이터프레임에서 슛 이벤트에 대한 기대 득점(xG) 값을 계산하여 추가합니다.
+    MomentumTracker 의 분 단위 모멘텀을 막대 그래프로 보여주는 창입니다.
+    위쪽 막대는 홈, 아래쪽 막대는 어웨이 모멘텀이 더 높은 구간입니다.
     """
-    # 슛과 관련된 Action만 필터링
-    shot_actions = ['Goal', 'Shot On Target', 'Shot', 'Blocked Shot']
-    # df.loc를 사용하여 SettingWithCopyWarning 방지
-    df_shots = df[df['Action'].isin(shot_actions)].copy()
-
-    if df_shots.empty:
-        df['xG'] = np.nan  # 슛 데이터가 없으면 xG 컬럼만 추가
-        return df
-
-    # 골대의 위치는 (105, 34)로 고정 (필드 오른쪽 끝 중앙)
-    goal_x, goal_y = 105, 34
-
-    # 보정된 좌표(_adj)를 사용하여 골문과의 거리를 계산
-    distance = np.sqrt(
-        (goal_x - df_shots['StartX_adj']) ** 2 + (goal_y - df_shots['StartY_adj']) ** 2
-    )
-
-    # 거리를 기반으로 xG 값을 계산하는 간단한 모델
-    # (거리가 멀수록 xG는 급격히 감소)
-    xg_values = 1 / (1 + np.exp(0.14 * distance - 2.5))
 
-    # 원본 df_shots에 xG 값을 할당
-    df_shots['xG'] = xg_values
+    CHART_WIDTH = 600
+    CHART_HEIGHT = 240
 
-    # 원본 데이터프레임(df)에 xG 값을 합치기 (슛이 아닌 이벤트는 NaN)
-    # df.merge를 사용하여 안전하게 병합
-    df = pd.merge(df, df_shots[['No', 'xG']], on='No', how='left')
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Momentum")
+        self.setWindowFlags(QtCore.Qt.Window | QtCore.Qt.WindowCloseButtonHint)
+        self.scene = QGraphicsScene(self)
+        self.view = QtWidgets.QGraphicsView(self.scene, self)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.view)
+        self.resize(self.CHART_WIDTH + 40, self.CHART_HEIGHT + 60)
+
+    def refresh(self, tracker):
+        self.scene.clear()
+        minutes = [(half, minute) for half in tracker.halves() for minute in tracker.minute_range(half)]
+        mid_y = self.CHART_HEIGHT / 2
+        self.scene.addLine(0, mid_y, self.CHART_WIDTH, mid_y, QtGui.QPen(QtGui.QColor("#999999")))
+        if not minutes:
+            return
 
-    return df
+        diffs = [tracker.momentum(half, 'home', minute) - tracker.momentum(half, 'away', minute)
+                 for half, minute in minutes]
+        scale = (mid_y - 10) / max(max(abs(d) for d in diffs), 1)
+        bar_w = self.CHART_WIDTH / len(minutes)
+        home_color, away_color = QtGui.QColor("#FF7740"), QtGui.QColor("#5B7DB1")
 
-def calculate_shooting_score(df_shooter_summary):
-    """
-    선수별 슈팅 요약 통계로부터 슈팅 점수를 계산합니다. (태그 보너스 추가)
-    """
-    summary = df_shooter_summary.copy()
-    if summary.empty:
-        return summary
+        prev_half = None
+        for i, ((half, minute), diff) in enumerate(zip(minutes, diffs)):
+            x = i * bar_w
+            if half != prev_half:
+                # 전/후반 시작 위치 표시
+                self.scene.addLine(x, 0, x, self.CHART_HEIGHT, QtGui.QPen(QtGui.QColor("#CCCCCC")))
+                self.scene.addText(f"{half} {minute}'").setPos(x, 0)
+                prev_half = half
+            height = abs(diff) * scale
+            color = home_color if diff >= 0 else away_color
+            top = mid_y - height if diff >= 0 else mid_y
+            self.scene.addRect(x, top, max(bar_w - 1, 1), height, QtGui.QPen(color), QtGui.QBrush(color))
+        self.scene.setSceneRect(0, 0, self.CHART_WIDTH, self.CHART_HEIGHT)
 
-    # 1. 기본 점수 계산
-    finishing_score = (summary['Goals'] - summary['Total_xG']) * 15
-    threat_score = summary['Total_xG'] * 20
 
-    # ▼▼▼▼▼ (추가된 부분) 태그 기반 보너스 점수 계산 ▼▼▼▼▼
-    # 헤더 골은 1골당 3점, 박스 밖 골은 1골당 5점의 보너스
-    headed_bonus = summary.get('Headed_Goals', 0) * 3
-    outbox_bonus = summary.get('Outbox_Gals', 0) * 5  # Outbox_Goals
+class ListWidgetLogView:
+    """ QListWidget 의 로그 텍스트를 복사 없이 시퀀스처럼 읽기 위한 뷰 """
 
-    summary['Specialty_Bonus'] = headed_bonus + outbox_bonus
-    # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
+    def __init__(self, list_widget):
+        self.list_widget = list_widget
 
-    summary['Raw_Shooting_Score'] = finishing_score + threat_score + summary['Specialty_Bonus']
+    def __len__(self):
+        return self.list_widget.count()
 
-    # 2. Sigmoid 함수로 1~100점 변환
-    mid_point = 10
-    steepness = 0.15
-    raw_scores = summary['Raw_Shooting_Score']
-    shooting_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
+    def __getitem__(self, idx):
+        if not 0 <= idx < self.list_widget.count():
+            raise IndexError(idx)
+        return self.list_widget.item(idx).text()
 
-    summary['Shooting_Score'] = shooting_scores.round(0).astype(int)
-    return summary
 
-def calculate_cross_score(df_cross_summary):
-    """
-    선수별 크로스 요약 통계로부터 CRO 스탯 점수를 계산합니다.
+class PitchViewController(QtCore.QObject):
     """
-    summary = df_cross_summary.copy()
-    if summary.empty:
-        return summary
+    경기장 QGraphicsView 의 확대 / 이동 / 클릭 처리.
 
-    # Raw Score 계산: (정확도 * 70%) + (성공 횟수 보너스)
-    accuracy_score = summary['Cross_Accuracy'] * 0.7
-    volume_bonus = np.log1p(summary['Successful_Crosses']) * 3
-    summary['Raw_Cross_Score'] = accuracy_score + volume_bonus
-
-    # Sigmoid 함수로 1~100점 변환
-    mid_point = 40  # Raw Score 40점을 평균(50점)으로 설정
-    steepness = 0.1
-    raw_scores = summary['Raw_Cross_Score']
-    cross_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
-
-    summary['Cross_Score'] = cross_scores.round(0).astype(int)
-    return summary
-
-def calculate_tackle_score(df_tackle_summary):
+    - 휠: 마우스 위치 기준 확대/축소 (1 ~ MAX_ZOOM 배)
+    - 오른쪽(가운데) 버튼 드래그: 확대된 화면 이동, 오른쪽 더블클릭: 전체 보기
+    - 왼쪽 클릭: clicked(x_meter, y_meter, scene_pos) 신호
+    창 크기가 바뀌면 확대 배율과 화면 중심을 유지한 채 다시 맞춥니다.
     """
-    선수별 태클 요약 통계로부터 TAC 스탯 점수를 계산합니다.
-    """
-    summary = df_tackle_summary.copy()
-    if summary.empty:
-        return summary
-
-    # Raw Score 계산: (성공률 * 60%) + (성공 횟수 보너스)
-    accuracy_score = summary['Tackle_Success_Rate'] * 0.6
-    volume_bonus = np.log1p(summary['Successful_Tackles']) * 4
-    summary['Raw_Tackle_Score'] = accuracy_score + volume_bonus
 
-    # Sigmoid 함수로 1~100점 변환
-    mid_point = 50  # Raw Score 50점을 평균(50점)으로 설정
-    steepness = 0.1
-    raw_scores = summary['Raw_Tackle_Score']
-    tackle_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
-
-    summary['Tackle_Score'] = tackle_scores.round(0).astype(int)
-    return summary
+    clicked = QtCore.pyqtSignal(float, float, QtCore.QPointF)
+
+    MAX_ZOOM = 8.0
+    ZOOM_STEP = 1.25
+
+    def __init__(self, view, pitch_rect, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.pitch_rect = pitch_rect
+        # 장면 좌표 ↔ 미터 변환은 필드 이미지 위치로 한 번만 계산 (화면 크기/배율과 무관)
+        self.transform = PitchTransform(pitch_rect.width(), pitch_rect.height(), pitch_rect.left(), pitch_rect.top())
+        self.zoom = 1.0
+        self._pan_origin = None
+
+        view.setSceneRect(pitch_rect)
+        view.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
+        view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        view.viewport().installEventFilter(self)
+
+    def fit(self, keep_center=True):
+        center = self.view.mapToScene(self.view.viewport().rect().center()) if keep_center else None
+        self.view.fitInView(self.pitch_rect, QtCore.Qt.KeepAspectRatio)
+        if self.zoom != 1.0:
+            self.view.scale(self.zoom, self.zoom)
+            if center is not None:
+                self.view.centerOn(center)
+
+    def reset_zoom(self):
+        self.zoom = 1.0
+        self.fit(keep_center=False)
 
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QtCore.QEvent.Wheel:
+            steps = event.angleDelta().y() / 120
+            zoom = min(max(self.zoom * self.ZOOM_STEP ** steps, 1.0), self.MAX_ZOOM)
+            if zoom == 1.0:
+                self.reset_zoom()
+            else:
+                self.view.scale(zoom / self.zoom, zoom / self.zoom)
+                self.zoom = zoom
+            return True
+        if kind == QtCore.QEvent.MouseButtonDblClick and event.button() == QtCore.Qt.RightButton:
+            self.reset_zoom()
+            return True
+        if kind == QtCore.QEvent.MouseButtonPress:
+            if event.button() in (QtCore.Qt.RightButton, QtCore.Qt.MiddleButton):
+                self._pan_origin = event.pos()
+                return True
+            if event.button() == QtCore.Qt.LeftButton:
+                scene_pos = self.view.mapToScene(event.pos())
+                x_meter, y_meter = self.transform.to_log_position(scene_pos.x(), scene_pos.y())
+                self.clicked.emit(x_meter, y_meter, scene_pos)
+                return True
+        if kind == QtCore.QEvent.MouseMove and self._pan_origin is not None:
+            delta = event.pos() - self._pan_origin
+            self._pan_origin = event.pos()
+            self.view.horizontalScrollBar().setValue(self.view.horizontalScrollBar().value() - delta.x())
+            self.view.verticalScrollBar().setValue(self.view.verticalScrollBar().value() - delta.y())
+            return True
+        if kind == QtCore.QEvent.MouseButtonRelease and self._pan_origin is not None:
+            self._pan_origin = None
+            return True
+        if kind == QtCore.QEvent.Resize:
+            self.fit()
+        return False
 
-def calculate_heading_score(df_heading_summary):
-    """
-    선수별 헤딩 요약 통계로부터 HED 스탯 점수를 계산합니다.
-    """
-    summary = df_heading_summary.copy()
-    if summary.empty:
-        return summary
-
-    # 필요한 컬럼이 없을 경우 0으로 채우기
-    required_cols = ['Aerial_Duel_Success_Rate', 'Headed_SOT_Rate', 'Aerial_Duels_Won']
-    for col in required_cols:
-        if col not in summary.columns:
-            summary[col] = 0
-
-    # Raw Score 계산: (공중볼 성공률 * 50%) + (헤딩 유효슛 비율 * 30%) + (공중볼 성공 횟수 보너스)
-    aerial_score = summary['Aerial_Duel_Success_Rate'] * 0.5
-    shot_score = summary['Headed_SOT_Rate'] * 0.3
-    volume_bonus = np.log1p(summary['Aerial_Duels_Won']) * 2
-    summary['Raw_Heading_Score'] = aerial_score + shot_score + volume_bonus
-
-    # Sigmoid 함수로 1~100점 변환
-    mid_point = 45
-    steepness = 0.1
-    raw_scores = summary['Raw_Heading_Score']
-    heading_scores = 100 / (1 + np.exp(-steepness * (raw_scores - mid_point)))
-
-    summary['Heading_Score'] = heading_scores.round(0).astype(int)
-    return summary
 
 class DataLogUI(QDialog):
     def __init__(self):
@@ -444,24 +207,67 @@ class DataLogUI(QDialog):
         # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
 
         # ⚽ 경기장 설정
-        self.FIELD_WIDTH = 105
-        self.FIELD_HEIGHT = 68
-        self.PIXEL_WIDTH = 600
-        self.PIXEL_HEIGHT = 383
         self.scene = QGraphicsScene(self)
         self.footballfield.setScene(self.scene)
-        self.footballfield.setSceneRect(0, 0, self.PIXEL_WIDTH, self.PIXEL_HEIGHT)
-        self.footballfield.mousePressEvent = self.on_field_click
         self.dot_items = []
+        self.dot_positions = []  # 도트별 미터 좌표 (클릭 시점에 계산해 저장)
 
         # ⚽ 필드 이미지 삽입
         self.field_pixmap = QtGui.QPixmap(resource_path("assets/football_field.png"))
         self.field_item = QGraphicsPixmapItem(self.field_pixmap)
         self.scene.addItem(self.field_item)
 
+        # 🔍 필드 이미지 크기 기준 좌표 변환 + 휠 확대 / 오른쪽 드래그 이동
+        pitch_rect = self.field_item.sceneBoundingRect()
+        self.scene.setSceneRect(pitch_rect)
+        self.pitch_view = PitchViewController(self.footballfield, pitch_rect, self)
+        self.pitch_view.clicked.connect(self.on_field_click)
+
         # 📃 리스트 위젯 설정 (Drag & Drop 지원)
         self.listWidget.setDragDropMode(self.listWidget.InternalMove)
 
+        # 💾 CSV 스트리밍 저장 (Save 이후 로그 변경 시 자동으로 파일에 반영)
+        self.stream_exporter = None
+        self._stream_dirty_from = None
+        self._stream_sync_pending = False
+        log_model = self.listWidget.model()
+        log_model.rowsInserted.connect(lambda parent, first, last: self.mark_stream_dirty(first))
+        log_model.rowsRemoved.connect(lambda parent, first, last: self.mark_stream_dirty(first))
+        log_model.rowsMoved.connect(
+            lambda parent, start, end, dest, row: self.mark_stream_dirty(min(start, row)))
+        log_model.dataChanged.connect(lambda top_left, bottom_right, roles=None: self.mark_stream_dirty(top_left.row()))
+        log_model.modelReset.connect(lambda: self.mark_stream_dirty(0))
+
+        # 📈 분 단위 모멘텀 (새 로그는 증분 반영, 삭제/수정 시에만 전체 재계산)
+        self.momentum_tracker = MomentumTracker()
+        self.momentum_dialog = None
+        self._momentum_rebuild_pending = False
+        log_model.rowsInserted.connect(lambda parent, first, last: self.add_momentum_rows(first, last))
+        log_model.rowsRemoved.connect(lambda parent, first, last: self.schedule_momentum_rebuild())
+        log_model.dataChanged.connect(lambda top_left, bottom_right, roles=None: self.schedule_momentum_rebuild())
+        log_model.modelReset.connect(self.schedule_momentum_rebuild)
+
+        # 📡 실시간 통계 서버 (읽기 전용). 추가/삭제는 변경분만 넘기고, 이동/수정은 전체를 한 번에 다시 보냄
+        self.stats_server = None
+        self._server_reset_pending = False
+        log_model.rowsInserted.connect(lambda parent, first, last: self.publish_rows_inserted(first, last))
+        log_model.rowsRemoved.connect(lambda parent, first, last: self.publish_rows_removed(first, last))
+        log_model.rowsMoved.connect(lambda *args: self.schedule_server_reset())
+        log_model.dataChanged.connect(lambda *args: self.schedule_server_reset())
+        log_model.modelReset.connect(self.schedule_server_reset)
+
+        # 🪪 선수 명단 (TeamID + 등번호 + 기간 → PlayerID). 사용자 데이터 폴더의 roster.csv 를 한 번 읽어 색인
+        # (예전 버전이 작업 폴더에 저장한 roster.csv 가 있으면 처음 한 번 그것을 읽고, 이후 저장은 데이터 폴더로)
+        self.roster_path = default_roster_path(user_data_dir())
+        self.roster_save_warned = False
+        initial_roster = self.roster_path if os.path.exists(self.roster_path) else default_roster_path()
+        self.roster = RosterRegistry.load(initial_roster) if os.path.exists(initial_roster) else RosterRegistry()
+
+        # 📅 경기 날짜 (명단 기간 조회 / 저장 파일의 Date 컬럼). 기본값은 오늘, 파일을 불러오면 그 파일의 Date 로 바뀜
+        self.dateEdit_match.setDate(QDate.currentDate())
+        self.match_date = self.dateEdit_match.date().toString(QtCore.Qt.ISODate)
+        self.dateEdit_match.dateChanged.connect(self.set_match_date)
+
         # 🖼️ 로고 이미지 삽입
         self.logo_scene = QGraphicsScene(self)
         self.logo.setScene(self.logo_scene)
@@ -482,6 +288,10 @@ class DataLogUI(QDialog):
         self.pushButton_savedata.clicked.connect(self.export_log)
         self.pushButton_export.clicked.connect(self.export_log)
         self.pushButton_uploaddata.clicked.connect(self.upload_data)
+        self.pushButton_momentum.clicked.connect(self.show_momentum_chart)
+        self.pushButton_roster.clicked.connect(self.load_roster)
+        self.pushButton_server.clicked.connect(self.toggle_stats_server)
+        self.pushButton_merge.clicked.connect(self.merge_data)
         self.setup_radio_groups()
 
         # timeline 분 단위 카운터
@@ -498,16 +308,8 @@ class DataLogUI(QDialog):
         self.installEventFilter(self)
 
         # --- ▼▼▼ (수정) 새로운 스탯 사전 정의 ▼▼▼ ---
-        self.ACTION_CODES = {
-            's': 'Pass', 'c': 'Cross', 'r': 'Dribble', 'e': 'Breakthrough',
-            't': 'Tackle', 'u': 'Duel', 'd': 'Shot', 'dd': 'Shot On Target',
-            'ddd': 'Goal', 'db': 'Blocked Shot', 'i': 'Intercept', 'l': 'Clear',
-            'b': 'Block', 'q': 'Acquisition', 'v': 'Save', 'm': 'Miss', 'f': 'Foul', 'o': 'Offside'
-        }
-        self.TAG_CODES = {
-            'k': 'Key', 'a': 'Assist', 'h': 'Header', 'r': 'Aerial',
-            'w': 'Suffered', 'n': 'In-box', 'u': 'Out-box'
-        }
+        self.ACTION_CODES = ACTION_CODES
+        self.TAG_CODES = TAG_CODES
         # 두 선수 상호작용이 필요한 액션 코드 정의
         self.TWO_PLAYER_ACTIONS = ['ss', 's', 'cc', 'c']
 
@@ -521,6 +323,52 @@ class DataLogUI(QDialog):
 
         return match_id, teamid_h, teamid_a
 
+    def load_roster(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Load Roster", "", "CSV Files (*.csv)")
+        if not file_path:
+            return
+        try:
+            self.roster = RosterRegistry.load(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"명단을 불러오는 중 오류 발생: {str(e)}")
+            return
+        self.roster_path = file_path
+        if self.stream_exporter is not None:
+            # PlayerID 가 바뀔 수 있으므로 스트리밍 파일 전체를 다시 기록
+            self.stream_exporter.roster = self.roster
+            self.mark_stream_dirty(0)
+        if self.stats_server is not None:
+            # 서버가 보낸 이벤트의 PlayerID 도 새 명단 기준으로 다시 계산해 전체를 다시 보냄
+            self.stats_server.roster = self.roster
+            self.schedule_server_reset()
+        QMessageBox.information(self, "명단", f"선수 {len(self.roster)}명을 불러왔습니다:\n{file_path}")
+
+    def set_match_date(self, date):
+        self.match_date = date.toString(QtCore.Qt.ISODate)
+        if self.stream_exporter is not None:
+            # Date / PlayerID 가 바뀌므로 스트리밍 파일 전체를 다시 기록
+            self.stream_exporter.match_date = self.match_date
+            self.mark_stream_dirty(0)
+        if self.stats_server is not None:
+            self.stats_server.match_date = self.match_date
+            self.schedule_server_reset()
+
+    def save_roster_if_grown(self, count_before):
+        # 명단에 없던 선수가 새 PlayerID 로 등록되었으면 다음 경기에서도 같은 ID 를 쓰도록 저장
+        if len(self.roster) <= count_before:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.roster_path), exist_ok=True)
+            self.roster.save(self.roster_path)
+            self.roster_save_warned = False
+        except OSError as e:
+            # 저장에 실패해도 입력 / 불러오기 / 내보내기는 그대로 진행 (명단은 메모리에 유지, 경고는 한 번만)
+            if not self.roster_save_warned:
+                self.roster_save_warned = True
+                QMessageBox.warning(self, "명단 저장 실패",
+                                    f"선수 명단을 저장하지 못했습니다:\n{self.roster_path}\n{str(e)}\n"
+                                    f"새로 등록된 PlayerID 는 프로그램을 종료하면 사라집니다.")
+
     def update_timeline_display(self):
         # 항상 MM:00 형식으로 표시
         mm = str(self.minute_counter).zfill(2)
@@ -577,75 +425,275 @@ class DataLogUI(QDialog):
             return
 
         try:
-            if file_path.endswith('.xlsx'):
-                df = pd.read_excel(file_path, sheet_name='Data')
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path)
-            else:
+            if not file_path.endswith(('.xlsx', '.csv')):
                 QMessageBox.warning(self, "Unsupported", "지원되지 않는 파일 형식입니다.")
                 return
+            df = read_event_file(file_path)
 
-            self.listWidget.clear()
+            # 파일 전체를 먼저 검사하고, 문제가 있으면 보고서를 보여준 뒤 복구 여부를 선택 (경고만 있으면 그대로 불러옴)
+            report = validate_events(df)
+            if has_errors(report):
+                df = self.confirm_repair(file_path, df, report)
+                if df is None:
+                    return
 
-            two_player_actions = ['Pass', 'Cross']
+            self.load_events(df)
 
-            for _, row in df.iterrows():
-                # --- ▼▼▼ (수정된 부분) 숫자 형식을 정수로 변환하는 로직 추가 ▼▼▼ ---
-                player_raw = row.get('Player', '')
-                receiver_raw = row.get('Receiver', '')
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"파일을 불러오는 중 오류 발생: {str(e)}")
 
-                # 실수를 정수로 변환한 뒤 문자열로 변경
-                player = str(int(float(player_raw))) if pd.notna(player_raw) and str(player_raw).strip() != '' else ''
-                receiver = str(int(float(receiver_raw))) if pd.notna(receiver_raw) and str(
-                    receiver_raw).strip() != '' else ''
-                # --- ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
 
-                half = str(row.get('Half', '')).strip()
-                team = str(row.get('Team', '')).strip()
-                direction = str(row.get('Direction', '')).strip()
-                time = str(row.get('Time', '')).strip()
-                action = str(row.get('Action', '')).strip()
-                start_x = str(row.get('StartX', '')).strip()
-                start_y = str(row.get('StartY', '')).strip()
-                end_x = str(row.get('EndX', '')).strip()
-                end_y = str(row.get('EndY', '')).strip()
-                tags = str(row.get('Tags', '')).strip()
+    def load_events(self, df):
+        """ 이벤트 데이터프레임을 로그 목록으로 불러옵니다. (기존 목록은 지움) """
+        for col in ('Player', 'Receiver'):
+            if col in df.columns:
+                df[col] = normalize_jersey(df[col])
+
+        # 파일에 Date 컬럼이 있으면 그 경기 날짜를 사용 (다시 저장해도 날짜와 PlayerID 가 바뀌지 않도록)
+        if 'Date' in df.columns:
+            file_dates = pd.to_datetime(df['Date'], errors='coerce').dropna()
+            if not file_dates.empty:
+                self.dateEdit_match.setDate(QDate.fromString(str(file_dates.mode()[0].date()), QtCore.Qt.ISODate))
+
+        # 파일의 선수들을 명단에서 찾아 두고, 없는 선수는 새 PlayerID 로 등록 (행별 Date 기준, 없으면 경기 날짜)
+        if ('TeamID' not in df.columns or df['TeamID'].isna().all()) and 'Team' in df.columns:
+            _, teamid_h, teamid_a = self.get_id_inputs()
+            team = df['Team'].astype(str).str.strip().str.lower()
+            df['TeamID'] = team.map({'home': teamid_h, 'away': teamid_a})
+        dated = df.assign(Date=pd.to_datetime(df['Date'], errors='coerce').fillna(pd.Timestamp(self.match_date))
+                          if 'Date' in df.columns else self.match_date)
+        roster_count = len(self.roster)
+        for col in ('Player', 'Receiver'):
+            if col in df.columns:
+                self.roster.resolve_frame(dated, col, date_col='Date', register=True)
+        self.save_roster_if_grown(roster_count)
+
+        log_texts = []
+        # 빈 칸(NaN)은 로그 문자열에 'nan' 으로 남지 않도록 빈 문자열로 바꿈
+        for row in df.astype(object).where(df.notna(), '').to_dict('records'):
+            # 선수 번호는 repair_events / normalize_jersey 에서 문자열로 통일됨
+            player = row.get('Player', '')
+            receiver = row.get('Receiver', '')
+
+            half = str(row.get('Half', '')).strip()
+            team = str(row.get('Team', '')).strip()
+            direction = str(row.get('Direction', '')).strip()
+            time = str(row.get('Time', '')).strip()
+            action = str(row.get('Action', '')).strip()
+            start_x = str(row.get('StartX', '')).strip()
+            start_y = str(row.get('StartY', '')).strip()
+            end_x = str(row.get('EndX', '')).strip()
+            end_y = str(row.get('EndY', '')).strip()
+            tags = str(row.get('Tags', '')).strip()
+
+            log_text = f"{half} | {team} | {direction} | {time} | Pos({start_x}, {start_y}) | {player} {action}"
+
+            if action in TWO_PLAYER_ACTIONS and receiver:
+                log_text += f" to {receiver} | Pos({end_x}, {end_y})"
+
+            if tags:
+                log_text += f" | Tags: {tags}"
+
+            log_texts.append(log_text)
+
+        # 한 번에 추가해야 rowsInserted 가 한 번만 발생 (모멘텀 / 스트리밍 / 서버 갱신)
+        self.listWidget.clear()
+        self.listWidget.addItems(log_texts)
+
+    def merge_data(self):
+        """ 같은 경기를 기록한 여러 파일을 중복 없이 합쳐 불러옵니다. """
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Merge Data", "", "Event Files (*.xlsx *.csv)"
+        )
+        if not file_paths:
+            return
 
-                log_text = f"{half} | {team} | {direction} | {time} | Pos({start_x}, {start_y}) | {player} {action}"
+        try:
+            match_id, _, _ = self.get_id_inputs()
+            try:
+                df, merge_report = merge_event_files(file_paths, match_id=match_id or None)
+            except ValueError as e:
+                QMessageBox.warning(self, "Merge", f"{e}\nMatch ID 를 입력한 뒤 다시 시도하세요.")
+                return
+            if df.empty:
+                QMessageBox.warning(self, "Merge", "합칠 이벤트가 없습니다.")
+                return
 
-                if action in two_player_actions and receiver:
-                    log_text += f" to {receiver} | Pos({end_x}, {end_y})"
+            report = validate_events(df)
+            if has_errors(report):
+                # 검증 보고서는 첫 파일 옆에 <파일명>_merged_validation.csv 로 저장
+                merged_path = os.path.splitext(file_paths[0])[0] + "_merged"
+                df = self.confirm_repair(merged_path, df, report)
+                if df is None:
+                    return
 
-                if tags:
-                    log_text += f" | Tags: {tags}"
+            self.load_events(df)
 
-                self.listWidget.addItem(log_text)
+            lines = [f"{os.path.basename(row.File)}: {row.Events}건 중 {row.Kept}건 사용 "
+                     f"(정확한 중복 {row.Exact_Duplicates}, 근접 중복 {row.Near_Duplicates})"
+                     for row in merge_report.itertuples(index=False)]
+            QMessageBox.information(self, "Merge",
+                                    f"{len(file_paths)}개 파일을 {len(df)}개 이벤트로 합쳤습니다.\n\n" + "\n".join(lines))
 
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"파일을 불러오는 중 오류 발생: {str(e)}")
+            QMessageBox.critical(self, "Error", f"파일을 합치는 중 오류 발생: {str(e)}")
+
+    def confirm_repair(self, file_path, df, report):
+        """ 검증 보고서를 보여주고, 자동 복구한 데이터프레임을 반환합니다. (취소 시 None) """
+        repairable = int(report['Repairable'].sum())
+        warnings = int((report['Severity'] == 'warning').sum())
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Warning)
+        box.setWindowTitle("데이터 검증")
+        box.setText(f"파일에서 {len(report)}건의 문제를 발견했습니다. (자동 복구 가능 {repairable}건, 경고 {warnings}건)\n"
+                    f"복구할 수 없는 문제가 있는 행은 제외하고 불러옵니다.\n\n{summarize_report(report)}")
+        repair_button = box.addButton("복구 후 불러오기", QMessageBox.AcceptRole)
+        save_button = box.addButton("보고서 저장", QMessageBox.ActionRole)
+        box.addButton(QMessageBox.Cancel)
+        box.exec_()
+
+        if box.clickedButton() == save_button:
+            report_path = os.path.splitext(file_path)[0] + "_validation.csv"
+            report.to_csv(report_path, index=False, encoding="utf-8-sig")
+            QMessageBox.information(self, "보고서 저장", f"검증 보고서를 저장했습니다:\n{report_path}")
+            return None
+        if box.clickedButton() != repair_button:
+            return None
+        return repair_events(df, report)
+
+    def on_field_click(self, x_meter, y_meter, scene_pos):
+        self.lineEdit_position.setText(f"{x_meter}, {y_meter}")
+
+        # 도트 찍기 (확대해도 화면에서 같은 크기로 보이도록 뷰 배율 무시)
+        radius = 5
+        color = QtGui.QColor("#FF7740")
+        dot = self.scene.addEllipse(
+            -radius, -radius,
+            radius * 2, radius * 2,
+            pen=QtGui.QPen(color),
+            brush=QtGui.QBrush(color)
+        )
+        dot.setPos(scene_pos)
+        dot.setFlag(QtWidgets.QGraphicsItem.ItemIgnoresTransformations)
+
+        self.dot_items.append(dot)  # 도트 리스트에 저장 ✅
+        self.dot_positions.append((x_meter, y_meter))
 
+    def mark_stream_dirty(self, row):
+        if self.stream_exporter is None:
+            return
+        # 맨 끝에 추가된 행은 StreamingCsvExporter 가 이어 쓰기로 처리하므로 그대로 넘겨도 됨
+        if self._stream_dirty_from is None or row < self._stream_dirty_from:
+            self._stream_dirty_from = row
+        # 같은 이벤트 루프 안의 여러 변경(드래그 이동 등)을 한 번의 기록으로 묶음
+        if not self._stream_sync_pending:
+            self._stream_sync_pending = True
+            QtCore.QTimer.singleShot(0, self._on_stream_sync_timer)
+
+    def _on_stream_sync_timer(self):
+        self._stream_sync_pending = False
+        if self.stream_exporter is None:
+            return
+        try:
+            self.sync_stream_export()
+        except Exception as e:
+            file_path = self.stream_exporter.file_path
+            self.stream_exporter = None
+            QMessageBox.warning(self, "스트리밍 저장 중단",
+                                f"CSV 파일에 기록하지 못해 스트리밍 저장을 중단합니다:\n{file_path}\n오류: {str(e)}")
+
+    def sync_stream_export(self):
+        dirty_from = self._stream_dirty_from
+        self._stream_dirty_from = None
+        self.stream_exporter.sync(ListWidgetLogView(self.listWidget), self.get_id_inputs(), dirty_from)
+
+    def _log_to_event(self, log):
+        try:
+            record = parse_log_line(log)
+        except IndexError:
+            return None  # 형식이 맞지 않는 로그는 모멘텀 계산에서 제외
+        record.update(analyze_pass_row(record))
+        return record
+
+    def add_momentum_rows(self, first, last):
+        for row in range(first, last + 1):
+            record = self._log_to_event(self.listWidget.item(row).text())
+            if record is not None:
+                self.momentum_tracker.add_event(record)
+        self.refresh_momentum_chart()
+
+    def schedule_momentum_rebuild(self):
+        if not self._momentum_rebuild_pending:
+            self._momentum_rebuild_pending = True
+            QtCore.QTimer.singleShot(0, self.rebuild_momentum)
+
+    def rebuild_momentum(self):
+        self._momentum_rebuild_pending = False
+        self.momentum_tracker.clear()
+        for log in ListWidgetLogView(self.listWidget):
+            record = self._log_to_event(log)
+            if record is not None:
+                self.momentum_tracker.add_event(record)
+        self.refresh_momentum_chart()
+
+    def show_momentum_chart(self):
+        if self.momentum_dialog is None:
+            self.momentum_dialog = MomentumChartDialog(self)
+        self.momentum_dialog.refresh(self.momentum_tracker)
+        self.momentum_dialog.show()
+        self.momentum_dialog.raise_()
+
+    def refresh_momentum_chart(self):
+        if self.momentum_dialog is not None and self.momentum_dialog.isVisible():
+            self.momentum_dialog.refresh(self.momentum_tracker)
+
+    def toggle_stats_server(self):
+        if self.stats_server is not None:
+            self.stats_server.stop()
+            self.stats_server = None
+            self.pushButton_server.setText("Live Server")
+            return
+        token = STATS_SERVER_TOKEN
+        if token is None and not is_loopback(STATS_SERVER_HOST):
+            token = secrets.token_urlsafe(16)
+        try:
+            server = StatsServer(STATS_SERVER_HOST, STATS_SERVER_PORT, roster=self.roster,
+                                 match_date=self.match_date, token=token)
+            host, port = server.start()
+        except Exception as e:
+            QMessageBox.critical(self, "서버 시작 실패", f"실시간 통계 서버를 시작하지 못했습니다:\n{str(e)}")
+            return
+        self.stats_server = server
+        server.publish_reset(list(ListWidgetLogView(self.listWidget)), self.get_id_inputs())
+        self.pushButton_server.setText("Stop Server")
+        query = f"?token={token}" if token else ""
+        QMessageBox.information(self, "실시간 통계 서버", f"http://{host}:{port}/events{query} (/score, /summary)\n"
+                                                     f"ws://{host}:{port}/ws{query}")
+
+    def publish_rows_inserted(self, first, last):
+        if self.stats_server is None:
+            return
+        logs = [self.listWidget.item(row).text() for row in range(first, last + 1)]
+        self.stats_server.publish_insert(first, logs, self.get_id_inputs())
 
-    def on_field_click(self, event):
-        if event.button() == QtCore.Qt.LeftButton:
-            scene_pos = self.footballfield.mapToScene(event.pos())
-            pixel_x = scene_pos.x()
-            pixel_y = scene_pos.y()
+    def publish_rows_removed(self, first, last):
+        if self.stats_server is not None:
+            self.stats_server.publish_remove(first, last)
 
-            x_meter = round(pixel_x * self.FIELD_WIDTH / self.PIXEL_WIDTH, 2)
-            y_meter = round((self.PIXEL_HEIGHT - pixel_y) * self.FIELD_HEIGHT / self.PIXEL_HEIGHT, 2)
-            self.lineEdit_position.setText(f"{x_meter}, {y_meter}")
+    def schedule_server_reset(self):
+        if self.stats_server is not None and not self._server_reset_pending:
+            self._server_reset_pending = True
+            QtCore.QTimer.singleShot(0, self.publish_server_reset)
 
-            # 도트 찍기
-            radius = 5
-            color = QtGui.QColor("#FF7740")
-            dot = self.scene.addEllipse(
-                pixel_x - radius, pixel_y - radius,
-                radius * 2, radius * 2,
-                pen=QtGui.QPen(color),
-                brush=QtGui.QBrush(color)
-            )
+    def publish_server_reset(self):
+        self._server_reset_pending = False
+        if self.stats_server is not None:
+            self.stats_server.publish_reset(list(ListWidgetLogView(self.listWidget)), self.get_id_inputs())
 
-            self.dot_items.append(dot)  # 도트 리스트에 저장 ✅
+    def closeEvent(self, event):
+        if self.stats_server is not None:
+            self.stats_server.stop()
+        super().closeEvent(event)
 
     def delete_selected_item(self):
         selected = self.listWidget.currentRow()
@@ -658,99 +706,53 @@ class DataLogUI(QDialog):
         file_path, _ = QFileDialog.getSaveFileName(self, "로그 저장", "", "Excel Files (*.xlsx);;CSV Files (*.csv)")
         if not file_path: return
 
-        logs = [self.listWidget.item(i).text() for i in range(self.listWidget.count())]
-        parsed_logs = []
-
-        for log in logs:
-            log_dict = {}
-            parts = log.split(' | ')
-            log_dict['Half'] = parts[0];
-            log_dict['Team'] = parts[1];
-            log_dict['Direction'] = parts[2];
-            log_dict['Time'] = parts[3]
-
-            pos_match = re.search(r'Pos\((.+?), (.+?)\)', parts[4])
-            if pos_match: log_dict['StartX'] = pos_match.group(1); log_dict['StartY'] = pos_match.group(2)
-
-            action_part = parts[5]
-            action_match = re.match(r'(\d+) (.+?)(?: to (\d+))?$', action_part)
-            if action_match:
-                log_dict['Player'] = action_match.group(1)
-                log_dict['Action'] = action_match.group(2)
-                log_dict['Receiver'] = action_match.group(3) if action_match.group(3) else ''
-
-            log_dict['EndX'] = '';
-            log_dict['EndY'] = '';
-            log_dict['Tags'] = ''
-            for part in parts[6:]:
-                if 'Pos' in part:
-                    end_pos_match = re.search(r'Pos\((.+?), (.+?)\)', part)
-                    if end_pos_match: log_dict['EndX'] = end_pos_match.group(1); log_dict['EndY'] = end_pos_match.group(
-                        2)
-                elif 'Tags' in part:
-                    log_dict['Tags'] = part.replace('Tags: ', '')
-
-            parsed_logs.append(log_dict)
+        if not file_path.endswith(".xlsx"):
+            # CSV 는 파일에 연결된 스트리밍 모드로 저장 (이후 입력은 자동으로 이어서 기록)
+            if not file_path.endswith('.csv'): file_path += '.csv'
+            try:
+                if self.stream_exporter is None or self.stream_exporter.file_path != file_path:
+                    self.stream_exporter = StreamingCsvExporter(file_path, self.roster, self.match_date)
+                roster_count = len(self.roster)
+                self.sync_stream_export()
+                self.save_roster_if_grown(roster_count)
+                QMessageBox.information(self, "저장 완료", f"분석된 로그를 성공적으로 저장했습니다:\n{file_path}\n"
+                                                       f"이후 입력되는 로그는 이 파일에 자동으로 이어서 기록됩니다.")
+            except Exception as e:
+                self.stream_exporter = None
+                QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류 발생:\n{str(e)}")
+            return
 
+        logs = [self.listWidget.item(i).text() for i in range(self.listWidget.count())]
         match_id, teamid_h, teamid_a = self.get_id_inputs()
-        for idx, log in enumerate(parsed_logs, start=1):
-            log["No"] = idx;
-            log["MatchID"] = match_id
-            team_val = str(log.get("Team", "")).strip().lower()
-            if team_val == "home":
-                log["TeamID"] = teamid_h
-            elif team_val == "away":
-                log["TeamID"] = teamid_a
-
-        columns = ["No", "MatchID", "TeamID", "Half", "Team", "Direction", "Time", "Player", "Receiver", "Action",
-                   "StartX", "StartY", "EndX", "EndY", "Tags"]
-        df = pd.DataFrame(parsed_logs).reindex(columns=columns)
+        parsed_logs = [build_log_record(log, idx, match_id, teamid_h, teamid_a, match_date=self.match_date)
+                       for idx, log in enumerate(logs, start=1)]
+
+        df = pd.DataFrame(parsed_logs).reindex(columns=LOG_COLUMNS)
+
+        # PlayerID / ReceiverID 는 데이터프레임 전체를 한 번에 명단과 조인
+        roster_count = len(self.roster)
+        df['PlayerID'] = self.roster.resolve_frame(df, 'Player', date=self.match_date, register=True)
+        receiver_id = pd.Series(self.roster.resolve_frame(df, 'Receiver', date=self.match_date, register=True),
+                                index=df.index)
+        df['ReceiverID'] = receiver_id.where(receiver_id >= 0)
+        self.save_roster_if_grown(roster_count)
 
         df_analyzed = analyze_pass_data(df.copy())
 
         try:
-            if file_path.endswith(".xlsx"):
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    # 여기에 ReadMe 시트 생성 로직 추가 가능
-                    df_analyzed_with_xg = add_xg_to_data(df_analyzed)
-                    df_pass_summary = create_player_summary(df_analyzed_with_xg)
-                    df_pass_scores = calculate_pass_score(df_pass_summary)
-                    df_shooter_summary = create_shooter_summary(df_analyzed_with_xg)
-                    df_shooter_scores = calculate_shooting_score(df_shooter_summary)
-
-                    df_analyzed_with_xg.to_excel(writer, sheet_name='Analyzed_Data', index=False)
-                    if not df_pass_summary.empty: df_pass_summary.to_excel(writer, sheet_name='Player_Summary')
-                    if not df_pass_scores.empty: df_pass_scores.to_excel(writer, sheet_name='Player_Score')
-                    if not df_shooter_summary.empty: df_shooter_summary.to_excel(writer, sheet_name='Shooter_Summary')
-                    if not df_shooter_scores.empty: df_shooter_scores.to_excel(writer, sheet_name='Shooting_Score')
-
-                    df_cross_summary = create_cross_summary(df_analyzed_with_xg)
-                    if not df_cross_summary.empty:
-                        df_cross_summary.to_excel(writer, sheet_name='Cross_Summary')
-
-                        df_cross_scores = calculate_cross_score(df_cross_summary)
-                        if not df_cross_scores.empty:
-                            df_cross_scores.to_excel(writer, sheet_name='Cross_Score')
-
-                    df_tackle_summary = create_tackle_summary(df_analyzed_with_xg)
-                    if not df_tackle_summary.empty:
-                        df_tackle_summary.to_excel(writer, sheet_name='Tackle_Summary')
-
-                        df_tackle_scores = calculate_tackle_score(df_tackle_summary)
-                        if not df_tackle_scores.empty:
-                            df_tackle_scores.to_excel(writer, sheet_name='Tackle_Score')
-
-                    df_heading_summary = create_heading_summary(df_analyzed_with_xg)
-                    if not df_heading_summary.empty:
-                        df_heading_summary.to_excel(writer, sheet_name='Heading_Summary')
-
-                        df_heading_scores = calculate_heading_score(df_heading_summary)
-                        if not df_heading_scores.empty:
-                            df_heading_scores.to_excel(writer, sheet_name='Heading_Score')
+            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+                # 여기에 ReadMe 시트 생성 로직 추가 가능
+                df_analyzed_with_xg = add_xg_to_data(df_analyzed)
+                df_analyzed_with_xg.to_excel(writer, sheet_name='Analyzed_Data', index=False)
 
-            else:
-                if not file_path.endswith('.csv'): file_path += '.csv'
-                df_analyzed.to_csv(file_path, index=False, encoding="utf-8-sig")
+                # 선수별 요약 / 점수 시트 (시즌 집계, 실시간 서버와 같은 구성)
+                for sheet_name, sheet in create_summary_sheets(df_analyzed_with_xg).items():
+                    if not sheet.empty:
+                        sheet.to_excel(writer, sheet_name=sheet_name)
+
+                df_momentum = create_momentum_timeline(df_analyzed_with_xg)
+                if not df_momentum.empty:
+                    df_momentum.to_excel(writer, sheet_name='Momentum', index=False)
 
             QMessageBox.information(self, "저장 완료", f"분석된 로그를 성공적으로 저장했습니다:\n{file_path}")
         except Exception as e:
@@ -821,22 +823,26 @@ class DataLogUI(QDialog):
 
             if player_to:
                 if len(self.dot_items) < 2: raise ValueError("두 개의 위치가 필요합니다.")
-                start_dot, end_dot = self.dot_items[-2].rect().center(), self.dot_items[-1].rect().center()
-                start_x = round(start_dot.x() * self.FIELD_WIDTH / self.PIXEL_WIDTH, 2)
-                start_y = round((self.PIXEL_HEIGHT - start_dot.y()) * self.FIELD_HEIGHT / self.PIXEL_HEIGHT, 2)
-                end_x = round(end_dot.x() * self.FIELD_WIDTH / self.PIXEL_WIDTH, 2)
-                end_y = round((self.PIXEL_HEIGHT - end_dot.y()) * self.FIELD_HEIGHT / self.PIXEL_HEIGHT, 2)
+                (start_x, start_y), (end_x, end_y) = self.dot_positions[-2], self.dot_positions[-1]
                 log_text = f"{half} | {team} | {direction} | {time} | Pos({start_x}, {start_y}) | {player_from} {action_name} to {player_to} | Pos({end_x}, {end_y})"
             else:
-                start_dot = self.dot_items[-1].rect().center()
-                start_x = round(start_dot.x() * self.FIELD_WIDTH / self.PIXEL_WIDTH, 2)
-                start_y = round((self.PIXEL_HEIGHT - start_dot.y()) * self.FIELD_HEIGHT / self.PIXEL_HEIGHT, 2)
+                start_x, start_y = self.dot_positions[-1]
                 log_text = f"{half} | {team} | {direction} | {time} | Pos({start_x}, {start_y}) | {player_from} {action_name}"
 
+            # 입력 시점에 명단에서 선수를 찾아 둠 (없으면 새 PlayerID 로 등록)
+            _, teamid_h, teamid_a = self.get_id_inputs()
+            team_id = teamid_h if team == 'home' else teamid_a
+            roster_count = len(self.roster)
+            for player in (player_from, player_to):
+                if player != '':
+                    self.roster.resolve(team_id, player, self.match_date, register=True)
+            self.save_roster_if_grown(roster_count)
+
             self.listWidget.addItem(log_text + log_tags_str)
 
             for dot in self.dot_items: self.scene.removeItem(dot)
             self.dot_items.clear()
+            self.dot_positions.clear()
             self.lineEdit_datainput.clear();
             self.lineEdit_position.clear()
 
@@ -846,7 +852,7 @@ class DataLogUI(QDialog):
 
     def showEvent(self, event):
         super().showEvent(event)
-        self.footballfield.fitInView(self.scene.sceneRect(), QtCore.Qt.KeepAspectRatio)
+        self.pitch_view.fit()
         self.logo.fitInView(self.logo_scene.sceneRect(), QtCore.Qt.KeepAspectRatio)
 
     def eventFilter(self, obj, event):
@@ -865,6 +871,7 @@ class DataLogUI(QDialog):
             # ⌫ 백스페이스 → 도트 삭제
             if event.key() == QtCore.Qt.Key_Backspace and self.dot_items:
                 last_dot = self.dot_items.pop()
+                self.dot_positions.pop()
                 self.scene.removeItem(last_dot)
                 return True
 
@@ -890,6 +897,7 @@ class DataLogUI(QDialog):
 
 if __name__ == "__main__":
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    app.setApplicationName("FPA Data Collector")
     app.setFont(QtGui.QFont("Arial", 10))
 
     # ✅ macOS Dock 아이콘 지정